@@ -7,24 +7,44 @@ __version__ = "0.1.7"
 
 
 from functools import wraps
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import random
+import re
+import reprlib
+import threading
+import time
+import weakref
+from time import perf_counter_ns
+from time import process_time_ns
+from time import thread_time_ns
 from timeit import default_timer as timer
-from contextlib import redirect_stdout
-from io import StringIO
+from contextlib import contextmanager
+from contextvars import Context
+from contextvars import ContextVar
+from contextvars import copy_context
+from io import TextIOBase
 from typing import Union
 from typing import Callable
 from typing import TypeVar
 from typing import Any
 from typing import Tuple
 from typing import Dict
+from typing import List
+from typing import Set
+from typing import Optional
+from typing import NamedTuple
 import sys
 from sys import getsizeof
 import platform
 import inspect
-import numpy as np
-from pympler.asizeof import asizeof  # type: ignore
-import psutil
+import itertools
+import json
+import math
+import struct
 
 
 LOG_FILE_NAME = "LOG"
@@ -33,6 +53,158 @@ CONSOLE_LOG_LEVEL = "critical"
 
 F = TypeVar("F", bound=Callable[..., Any])
 
+# Log levels accepted by the decorators
+_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
+# Global kill switch, see enable() and disable()
+_DISABLED = os.environ.get("PYDECLOG_DISABLE", "").lower() not in (
+    "",
+    "0",
+    "false",
+)
+
+# Log file backends and queue overflow policies, see configure()
+_BACKENDS = ("sync", "queue", "process", "direct", "ring")
+# When the direct backend syncs the log file to disk, see configure()
+_FSYNCS = ("never", "batch", "interval")
+# Handlers of the direct backend, whose buffers a forked child drops
+_DIRECT_HANDLERS: "weakref.WeakSet[_DirectFileHandler]" = weakref.WeakSet()
+_OVERFLOWS = ("block", "drop-oldest", "drop-newest")
+# Handlers of the queue backend, whose queues a forked child replaces
+_QUEUE_HANDLERS: "weakref.WeakSet[_QueueHandler]" = weakref.WeakSet()
+# Live file handlers, closed by close_all even once their logger is dropped
+_FILE_HANDLERS: "weakref.WeakSet[_FileHandler]" = weakref.WeakSet()
+
+# Process writing the log files of the process backend, see
+# _get_aggregator, the environment variable holding its token and
+# address, and the one holding the options of the log files it writes
+_AGGREGATOR: Optional[Any] = None
+_AGGREGATOR_ENV = "PYDECLOG_AGGREGATOR"
+_AGGREGATOR_FILES_ENV = "PYDECLOG_AGGREGATOR_FILES"
+_AGGREGATOR_LOCK = threading.Lock()
+# Handlers of the process backend, whose sockets a forked child drops
+_AGGREGATOR_HANDLERS: "weakref.WeakSet[_AggregatorHandler]" = weakref.WeakSet()
+# Seconds given to the writer process to drain its connections
+_AGGREGATOR_TIMEOUT = 10.0
+# Bytes read from a connection at once, written with a single flush
+_AGGREGATOR_READ = 1 << 16
+# Seconds between two checks of the writer process for its shutdown
+_AGGREGATOR_POLL = 0.1
+
+# Layouts of the records in a log file, see configure()
+_FORMATS = ("text", "json", "binary")
+
+# Layout of a ring log file: a header with the magic number, the slot
+# size and the slot count, then slots starting with their sequence
+# number, the length of the payload and of the message in it, the time,
+# the level and whether the record was truncated, see _RingHandler
+_RING_MAGIC = b"PYDLRNG1"
+_RING_HEADER = 64
+_RING_SLOT = struct.Struct("<QIIdBB")
+# Rings open in this process by path, shared by their handlers, and the
+# handlers which may hold one, see _RingHandler
+_RINGS: Dict[str, "_Ring"] = {}
+_RINGS_LOCK = threading.Lock()
+_RING_HANDLERS: "weakref.WeakSet[_RingHandler]" = weakref.WeakSet()
+
+# Compressions of rotated log files, and their file extension
+_COMPRESSIONS = {"gzip": ".gz", "zstd": ".zst"}
+# Thread compressing rotated log files, see _get_compressor
+_COMPRESSOR: Optional["_Compressor"] = None
+_COMPRESSOR_LOCK = threading.Lock()
+
+# Options set by configure(), keyed by (file name, file path)
+_CONFIGS: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+# Writers capturing the prints of the current task, see _capture_stream
+_CAPTURE: ContextVar[Optional[TextIOBase]] = ContextVar(
+    "pyDecLog_capture", default=None
+)
+_CAPTURE_STDERR: ContextVar[Optional[TextIOBase]] = ContextVar(
+    "pyDecLog_capture_stderr", default=None
+)
+
+# Behaviours that @instrument can combine in a single wrapper
+_ASPECTS = (
+    "arguments",
+    "description",
+    "machine",
+    "memory",
+    "message",
+    "signature",
+    "timing",
+    "typing",
+    "user",
+)
+
+# Signatures of the decorated functions, see _get_signature
+_SIGNATURES: "weakref.WeakKeyDictionary[Callable, _Signature]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Nanoseconds per unit of time accepted by @timing
+_TIME_UNITS = {
+    "ns": 1,
+    "us": 1_000,
+    "ms": 1_000_000,
+    "sec": 1_000_000_000,
+    "min": 60_000_000_000,
+    "hr": 3_600_000_000_000,
+}
+
+# Bytes per unit of memory accepted by @memory, and their label
+_MEM_UNITS = {
+    "bytes": (1, "bytes"),
+    "mb": (1.0e6, "MBs"),
+    "gb": (1.0e9, "GBs"),
+    "tb": (1.0e12, "TBs"),
+}
+
+# Size estimators by type, see register_size_estimator()
+_SIZE_ESTIMATORS: Dict[type, Callable[[Any], int]] = {}
+# Estimator found for each type measured so far
+_SIZE_DISPATCH: Dict[type, Callable[[Any], int]] = {}
+# Depth followed by the generic estimator in an object graph
+_SIZE_DEPTH = 16
+_SIZE_LOCK = threading.Lock()
+
+# Static facts about the machine, see _get_machine_facts
+_MACHINE_FACTS: Optional[Dict[str, Any]] = None
+# Threads sampling the machine load, keyed by interval in seconds
+_MACHINE_MONITORS: Dict[float, "_MachineMonitor"] = {}
+_MACHINE_LOCK = threading.Lock()
+
+# psutil handle of the current process, see _get_process
+_PROCESS: Optional[Any] = None
+
+# Who runs the process, see _get_user_identity
+_USER_IDENTITY: Optional[Tuple[str, Dict[str, Any]]] = None
+
+# Ways profile_locals catches the return of a function
+_PROFILE_BACKENDS = ("monitoring", "profile")
+# sys.monitoring tool id used by profile_locals, and weak references to
+# the handlers of each monitored code object
+_MONITORING_TOOL: Optional[int] = None
+_MONITORED_RETURNS: Dict[Any, Set["weakref.WeakMethod"]] = {}
+# Reentrant, weakref callbacks may run while it is held
+_PROFILE_LOCK = threading.RLock()
+
+# Whether tracemalloc was started by @memory(allocations=True)
+_TRACEMALLOC_STARTED = False
+
+# Statistics of @timing(aggregate=True), alive while their wrapper is
+_TIMING_STATS: "weakref.WeakSet[_TimingStats]" = weakref.WeakSet()
+
+# Process-wide logger registry: (file name, file path, console level)
+_LOGGERS: Dict[Tuple[str, str, str], logging.Logger] = {}
+_LOGGERS_LOCK = threading.Lock()
+
 
 def lprint(
     console_log_level: str = CONSOLE_LOG_LEVEL,
@@ -72,11 +244,11 @@ def _get_time(
     Parameters
     ----------
     t_start : float
-        kernel time at start of process.
+        kernel time at start of process, in seconds.
     t_end : float
-        Kernel time at end of process.
+        Kernel time at end of process, in seconds.
     unit : str
-        String describing unit of time: sec, min or hr.
+        String describing unit of time: ns, us, ms, sec, min or hr.
 
     Returns
     -------
@@ -88,16 +260,37 @@ def _get_time(
     TypeError
         Raise of the unit is not known.
     """
-    if unit.lower() == "sec":
-        return np.around(t_end - t_start, 3)
+    return _get_time_ns(round((t_end - t_start) * 1e9), unit)
 
-    elif unit.lower() == "min":
-        return np.around((t_end - t_start) / 60, 3)
 
-    elif unit.lower() == "hr":
-        return np.around((t_end - t_start) / 3600, 3)
-    else:
-        raise TypeError(f"Unit of time {unit} not known!")
+def _get_time_ns(elapsed_ns: float, unit: str) -> Union[float, TypeError]:
+    """Convert nanoseconds to the given unit.
+
+    Parameters
+    ----------
+    elapsed_ns : float
+        Elapsed time in nanoseconds.
+    unit : str
+        String describing unit of time: ns, us, ms, sec, min or hr.
+
+    Returns
+    -------
+    float
+        Elapsed time rounded to 3 decimals, unchanged for "ns".
+
+    Raises
+    ------
+    TypeError
+        Raise of the unit is not known.
+    """
+    try:
+        ns_per_unit = _TIME_UNITS[unit.lower()]
+    except KeyError:
+        raise TypeError(f"Unit of time {unit} not known!") from None
+
+    if ns_per_unit == 1:
+        return elapsed_ns
+    return round(elapsed_ns / ns_per_unit, 3)
 
 
 def timing(
@@ -107,6 +300,11 @@ def timing(
     console_log_level: str = CONSOLE_LOG_LEVEL,
     log_file_name: str = LOG_FILE_NAME,
     log_file_path: str = LOG_FILE_PATH,
+    cpu_time: bool = False,
+    aggregate: bool = False,
+    every_n: int = 1000,
+    every_sec: Optional[float] = None,
+    sampler: Optional["Sampler"] = None,
 ) -> Union[Callable[[F], F], RuntimeWarning]:
     """Wrap function with execution time.
 
@@ -115,7 +313,9 @@ def timing(
     func_ : None, optional
         Wrapped function, by default None.
     unit : str, optional
-        Unit of time: "sec", "min" or "hr", by default "sec".
+        Unit of time: "ns", "us", "ms", "sec", "min" or "hr", by default
+        "sec". Times are measured in integer nanoseconds and only
+        converted when logged.
     level : str, optional
         Log level: "debug", "info", "critical" or "error", by default "debug".
     console_log_level : str, optional
@@ -124,6 +324,21 @@ def timing(
         Name of the log file, by default LOG_FILE_NAME.
     log_file_path : str, optional
         Path of the log file, by default LOG_FILE_PATH.
+    cpu_time : bool, optional
+        Also log the process and thread CPU time spent in the call, to
+        tell CPU time from waiting, by default False.
+    aggregate : bool, optional
+        Keep running statistics and log a summary instead of one line per
+        call, by default False.
+    every_n : int, optional
+        With aggregate, log the summary every every_n calls, by default
+        1000. Use 0 to only log on time or at exit.
+    every_sec : float, optional
+        With aggregate, also log the summary when every_sec seconds have
+        passed since the last one, by default None.
+    sampler : Sampler, optional
+        Instrument only the calls picked by the sampler, by default None
+        for every call.
 
     Raises
     ------
@@ -132,22 +347,28 @@ def timing(
     """
 
     def _decorator(func):
-        @wraps(func)
-        def wrapper(self, *args, **kwargs):
-            time_start = timer()
-            output = func(self, *args, **kwargs)
-            time_end = timer()
+        # Resolve logger and level method once, at decoration time
+        log_level = _get_log_level(
+            level, console_log_level, log_file_name, log_file_path
+        )
 
-            log_level = _get_log_level(
-                level, console_log_level, log_file_name, log_file_path
-            )
+        # Fail at decoration time for unknown units
+        _get_time_ns(0, unit)
 
-            log_level(
-                f"{str(func.__name__)} was executed in: {str(_get_time(time_start, time_end, unit))} {unit}"
-            )
-            return output
+        if aggregate:
+            stats = _TimingStats(func, log_level, unit, every_n, every_sec)
+            _TIMING_STATS.add(stats)
+
+            def probe(log, args, kwargs):
+                time_start = perf_counter_ns()
+                yield
+                stats.add(perf_counter_ns() - time_start)
 
-        return wrapper
+            return _wrap(func, log_level, probe, sampler)
+
+        return _wrap(
+            func, log_level, _timing_probe(func, unit, cpu_time), sampler
+        )
 
     if callable(func_):
         return _decorator(func_)
@@ -157,15 +378,299 @@ def timing(
         raise RuntimeWarning("Positional arguments are not supported!")
 
 
+def _timing_probe(func: Callable, unit: str, cpu_time: bool) -> Callable:
+    """Build the probe logging the duration of a call."""
+
+    if cpu_time:
+
+        def cpu_probe(log, args, kwargs):
+            process_start = process_time_ns()
+            thread_start = thread_time_ns()
+            time_start = perf_counter_ns()
+            yield
+            time_end = perf_counter_ns()
+            thread_end = thread_time_ns()
+            process_end = process_time_ns()
+
+            log(
+                f"{str(func.__name__)} was executed in: {_get_time_ns(time_end - time_start, unit)} {unit}"
+                f" | process CPU: {_get_time_ns(process_end - process_start, unit)} {unit}"
+                f" | thread CPU: {_get_time_ns(thread_end - thread_start, unit)} {unit}",
+                extra=_extra(
+                    func,
+                    "timing",
+                    duration_ns=time_end - time_start,
+                    process_ns=process_end - process_start,
+                    thread_ns=thread_end - thread_start,
+                ),
+            )
+
+        return cpu_probe
+
+    def probe(log, args, kwargs):
+        time_start = perf_counter_ns()
+        yield
+        time_end = perf_counter_ns()
+
+        log(
+            f"{str(func.__name__)} was executed in: {_get_time_ns(time_end - time_start, unit)} {unit}",
+            extra=_extra(func, "timing", duration_ns=time_end - time_start),
+        )
+
+    return probe
+
+
+class _Sketch:
+    """Mergeable quantile sketch with relative accuracy.
+
+    Values are counted in logarithmic buckets, so any quantile is known
+    within the relative error alpha and two sketches merge by adding
+    their counts.
+
+    Parameters
+    ----------
+    alpha : float, optional
+        Relative accuracy of the quantiles, by default 0.01.
+    """
+
+    def __init__(self, alpha: float = 0.01) -> None:
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: "_Sketch") -> None:
+        self.count += other.count
+        self.zeros += other.zeros
+        for index, count in list(other.buckets.items()):
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return 2 * self.gamma**index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class _Stripe:
+    """Running timing statistics of one thread."""
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = _Sketch()
+
+    def add(self, value: float) -> None:
+        # Welford's online update
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.sketch.add(value)
+
+    def merge(self, other: "_Stripe") -> None:
+        # Chan's parallel update
+        count = self.count + other.count
+        if count == 0:
+            return
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+
+class _TimingStats:
+    """Aggregated timings of a function decorated by @timing.
+
+    Every thread updates its own stripe without locking. Stripes are
+    merged only when the summary is read or logged. Only the names of
+    the function are kept, not the function itself.
+
+    Parameters
+    ----------
+    func : Callable
+        Decorated function.
+    log_level : Callable
+        Logger method used for the summary.
+    unit : str
+        Unit of time of the summary.
+    every_n : int
+        Log the summary every every_n calls, 0 to disable.
+    every_sec : float, optional
+        Log the summary every every_sec seconds, None to disable.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        log_level: Callable[..., Any],
+        unit: str,
+        every_n: int,
+        every_sec: Optional[float],
+    ) -> None:
+        self.name = f"{func.__module__}.{func.__qualname__}"
+        self.qualname = func.__qualname__
+        self.log_level = log_level
+        self.unit = unit
+        self.every_n = every_n
+        self.every_sec = every_sec
+        self.pending = False
+        self._local = threading.local()
+        self._stripes: List[_Stripe] = []
+        self._lock = threading.Lock()
+        self._calls = itertools.count(1)
+        self._last_emit = timer()
+
+    def add(self, elapsed: int) -> None:
+        stripe = getattr(self._local, "stripe", None)
+        if stripe is None:
+            stripe = self._local.stripe = _Stripe()
+            with self._lock:
+                self._stripes.append(stripe)
+        stripe.add(elapsed)
+        self.pending = True
+
+        # next() on itertools.count is atomic under the GIL
+        calls = next(self._calls)
+        if self.every_n and calls % self.every_n == 0:
+            self.emit()
+        elif (
+            self.every_sec is not None
+            and timer() - self._last_emit >= self.every_sec
+        ):
+            self.emit()
+
+    def stripes(self) -> List[_Stripe]:
+        with self._lock:
+            return list(self._stripes)
+
+    def summary(self) -> Dict[str, float]:
+        return _summarize(self.stripes())
+
+    def emit(self) -> None:
+        self._last_emit = timer()
+        self.pending = False
+        stats = self.summary()
+
+        def fmt(value):
+            return _get_time_ns(value, self.unit)
+
+        self.log_level(
+            f"{self.name} timing over {stats['count']} calls: "
+            f"mean {fmt(stats['mean'])} | "
+            f"std {fmt(math.sqrt(stats['variance']))} | "
+            f"min {fmt(stats['min'])} | max {fmt(stats['max'])} | "
+            f"p50 {fmt(stats['p50'])} | p95 {fmt(stats['p95'])} | "
+            f"p99 {fmt(stats['p99'])} {self.unit}",
+            extra={
+                "pydeclog": {
+                    "function": self.qualname,
+                    "event": "timing_summary",
+                    **stats,
+                }
+            },
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            for stripe in self._stripes:
+                stripe.clear()
+        self.pending = False
+
+
+def _summarize(stripes: List[_Stripe]) -> Dict[str, float]:
+    """Merge timing stripes into a summary."""
+    merged = _Stripe()
+    for stripe in stripes:
+        merged.merge(stripe)
+
+    count = merged.count
+    return {
+        "count": count,
+        "sum": merged.mean * count,
+        "min": merged.min if count else math.nan,
+        "max": merged.max if count else math.nan,
+        "mean": merged.mean if count else math.nan,
+        "variance": merged.m2 / (count - 1) if count > 1 else 0.0,
+        "p50": merged.sketch.quantile(0.50),
+        "p95": merged.sketch.quantile(0.95),
+        "p99": merged.sketch.quantile(0.99),
+    }
+
+
+def get_timing_stats() -> Dict[str, Dict[str, float]]:
+    """Return the statistics of every @timing(aggregate=True) function.
+
+    Returns
+    -------
+    dict
+        Maps the function module and qualified name to its count, sum,
+        min, max, mean, variance, p50, p95 and p99, in nanoseconds.
+        Functions sharing a name, such as closures made by one factory,
+        are merged.
+    """
+    stripes: Dict[str, List[_Stripe]] = {}
+    for stats in list(_TIMING_STATS):
+        stripes.setdefault(stats.name, []).extend(stats.stripes())
+    return {name: _summarize(merged) for name, merged in stripes.items()}
+
+
+def reset_timing_stats() -> None:
+    """Clear the statistics of every @timing(aggregate=True) function."""
+    for stats in list(_TIMING_STATS):
+        stats.reset()
+
+
+def _flush_timing_stats() -> None:
+    """Log the summaries holding calls not logged yet."""
+    for stats in list(_TIMING_STATS):
+        if stats.pending:
+            stats.emit()
+
+
 def message(
     func_: None = None,
     level: str = "info",
     console_log_level: str = CONSOLE_LOG_LEVEL,
     log_file_name: str = LOG_FILE_NAME,
     log_file_path: str = LOG_FILE_PATH,
+    stderr: bool = False,
+    batch: int = 1,
+    max_line: int = 65536,
+    sampler: Optional["Sampler"] = None,
 ) -> Union[Callable[[F], F], RuntimeWarning]:
     """Collect and pip all functions calls.
 
+    Lines are logged as soon as they are complete, so only the line
+    being written is held in memory.
+
     Parameters
     ----------
     func_ : None, optional
@@ -178,6 +683,16 @@ def message(
         Name of the log file, by default LOG_FILE_NAME.
     log_file_path : str, optional
         Path of the log file, by default LOG_FILE_PATH.
+    stderr : bool, optional
+        Also log what is written to sys.stderr, by default False.
+    batch : int, optional
+        Number of lines joined into one record, by default 1.
+    max_line : int, optional
+        Longest partial line kept in memory, longer lines are logged in
+        chunks of max_line characters, by default 65536.
+    sampler : Sampler, optional
+        Instrument only the calls picked by the sampler, by default None
+        for every call.
 
     Raises
     ------
@@ -186,22 +701,13 @@ def message(
     """
 
     def _decorator(func):
-        @wraps(func)
-        def wrapper(self, *args, **kwargs):
-            s = StringIO()
-            with redirect_stdout(s):
-                output = func(self, *args, **kwargs)
-
-            log_level = _get_log_level(
-                level, console_log_level, log_file_name, log_file_path
-            )
-            for i in s.getvalue().split("\n"):
-                if i:
-                    log_level(i)
+        # Resolve logger and level method once, at decoration time
+        log_level = _get_log_level(
+            level, console_log_level, log_file_name, log_file_path
+        )
 
-            return output
-
-        return wrapper
+        probe = _message_probe(func, stderr, batch, max_line)
+        return _wrap(func, log_level, probe, sampler)
 
     if callable(func_):
         return _decorator(func_)
@@ -211,6 +717,103 @@ def message(
         raise RuntimeWarning("Positional arguments are not supported!")
 
 
+def _message_probe(
+    func: Callable,
+    stderr: bool = False,
+    batch: int = 1,
+    max_line: int = 65536,
+) -> Callable:
+    """Build the probe logging the prints of a call."""
+
+    extra = _extra(func, "message", stream="stdout")
+    stderr_extra = _extra(func, "message", stream="stderr")
+
+    def probe(log, args, kwargs):
+        out = _LineWriter(log, extra, batch, max_line)
+        if not stderr:
+            try:
+                with _capture_stdout(out):
+                    yield
+            finally:
+                out.close()
+            return
+
+        err = _LineWriter(log, stderr_extra, batch, max_line)
+        try:
+            with _capture_stdout(out), _capture_stream("stderr", err):
+                yield
+        finally:
+            out.close()
+            err.close()
+
+    return probe
+
+
+class _LineWriter(TextIOBase):
+    """Text stream logging every complete line written to it.
+
+    Parameters
+    ----------
+    log : Callable
+        Logger method receiving the lines.
+    extra : dict
+        Extra fields of the records, see _extra.
+    batch : int
+        Number of lines joined into one record.
+    max_line : int
+        Longest partial line kept before being logged anyway.
+    """
+
+    def __init__(
+        self, log: Callable, extra: Dict[str, Any], batch: int, max_line: int
+    ) -> None:
+        self._log = log
+        self._extra = extra
+        self._batch = batch
+        self._max_line = max_line
+        self._partial = ""
+        self._lines: List[str] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            raise TypeError(f"write() argument must be str, not {type(text)}")
+
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._forward(line)
+
+        while len(self._partial) > self._max_line:
+            self._forward(self._partial[: self._max_line])
+            self._partial = self._partial[self._max_line :]
+        return len(text)
+
+    def close(self) -> None:
+        """Log the last partial line and the lines waiting for a batch."""
+        if self.closed:
+            return
+        self._forward(self._partial)
+        self._partial = ""
+        if self._lines:
+            self._log("\n".join(self._lines), extra=self._extra)
+            self._lines.clear()
+        super().close()
+
+    def _forward(self, line: str) -> None:
+        if not line:
+            return
+        if self._batch <= 1:
+            self._log(line, extra=self._extra)
+            return
+        self._lines.append(line)
+        if len(self._lines) >= self._batch:
+            self._log("\n".join(self._lines), extra=self._extra)
+            self._lines.clear()
+
+
 def _get_log_level(
     level: str, console_log_level: str, log_file_name: str, log_file_path: str
 ) -> Union[Callable[[str], Any], TypeError]:
@@ -261,12 +864,355 @@ def _get_log_level(
     return log_level
 
 
+def _is_async(func: Callable) -> bool:
+    """Tell whether a function runs on an event loop."""
+    if inspect.iscoroutinefunction(func):
+        return True
+    return inspect.isasyncgenfunction(func)
+
+
+def _resume(steps, output: Any) -> None:
+    """Run the part of a probe following the wrapped call."""
+    try:
+        steps.send(output)
+    except StopIteration:
+        pass
+
+
+def _wrap(
+    func: Callable,
+    log_level: Callable[[str], Any],
+    probe: Callable,
+    sampler: Optional["Sampler"] = None,
+) -> Callable:
+    """Build the wrapper running a probe around every call of a function.
+
+    The probe is a generator function called with the logger method, the
+    args and the kwargs: the code before its single yield runs before the
+    call, the output is sent through the yield and the remaining code
+    runs after the call.
+    The probe is closed without resuming if the call raises.
+
+    Coroutine functions get an async wrapper probing the awaited call.
+    Async generators get one probing the whole iteration.
+
+    Parameters
+    ----------
+    func : Callable
+        Wrapped function.
+    log_level : Callable
+        Logger method returned by _get_log_level.
+    probe : Callable
+        Generator function instrumenting a call.
+    sampler : Sampler, optional
+        Pick the calls to instrument, by default None for every call.
+
+    Returns
+    -------
+    Callable
+        Wrapper, skipping the probe when the record would be dropped or
+        the call is not sampled.
+    """
+
+    is_enabled = log_level.__self__.isEnabledFor  # type: ignore
+    level_no = _LEVELS[log_level.__name__]
+
+    if inspect.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if (
+                _DISABLED
+                or not is_enabled(level_no)
+                or (sampler is not None and not sampler())
+            ):
+                return await func(*args, **kwargs)
+
+            steps = probe(log_level, args, kwargs)
+            next(steps)
+            try:
+                output = await func(*args, **kwargs)
+            except BaseException:
+                steps.close()
+                raise
+            _resume(steps, output)
+            return output
+
+    elif inspect.isasyncgenfunction(func):
+
+        def skip() -> bool:
+            return (
+                _DISABLED
+                or not is_enabled(level_no)
+                or (sampler is not None and not sampler())
+            )
+
+        return _wrap_async_generator(func, log_level, probe, skip)
+
+    else:
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if (
+                _DISABLED
+                or not is_enabled(level_no)
+                or (sampler is not None and not sampler())
+            ):
+                return func(*args, **kwargs)
+
+            steps = probe(log_level, args, kwargs)
+            next(steps)
+            try:
+                output = func(*args, **kwargs)
+            except BaseException:
+                steps.close()
+                raise
+            _resume(steps, output)
+            return output
+
+    return wrapper
+
+
+def _wrap_async_generator(
+    func: Callable, log_level: Callable, probe: Callable, skip: Callable
+) -> Callable:
+    """Build the wrapper of an async generator function, see _wrap.
+
+    The wrapped generator is driven step by step, so that the values and
+    exceptions sent with asend() and athrow() reach it.
+    """
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        steps = None
+        context = None
+        if not skip():
+            # The probe and the generator run in their own context, so
+            # that @message does not capture the prints of the consumer
+            context = copy_context()
+            steps = probe(log_level, args, kwargs)
+            context.run(next, steps)
+
+        inner = func(*args, **kwargs)
+        try:
+            sent = None
+            thrown = None
+            while True:
+                # Forward asend() and athrow() to the wrapped generator
+                if thrown is None:
+                    step = inner.asend(sent)
+                else:
+                    step = inner.athrow(thrown)
+                try:
+                    item = await _InContext(context, step)
+                except StopAsyncIteration:
+                    break
+                sent = None
+                thrown = None
+                try:
+                    sent = yield item
+                except GeneratorExit:
+                    await _InContext(context, inner.aclose())
+                    raise
+                except BaseException as error:
+                    thrown = error
+        except BaseException:
+            if steps is not None:
+                context.run(steps.close)
+            raise
+        if steps is not None:
+            context.run(_resume, steps, None)
+
+    return wrapper
+
+
+class _InContext:
+    """Awaitable running another awaitable in a given context.
+
+    Each step of the awaitable runs in the context, while the futures it
+    waits on are handed to the task awaiting this object.
+
+    Parameters
+    ----------
+    context : Context, optional
+        Context to run in, None for the current one.
+    awaitable : Awaitable
+        Awaitable to run.
+    """
+
+    def __init__(self, context: Optional[Context], awaitable) -> None:
+        self._context = context
+        self._awaitable = awaitable
+
+    def __await__(self):
+        if self._context is None:
+            return (yield from self._awaitable.__await__())
+
+        steps = self._awaitable.__await__()
+        run = self._context.run
+        sent = None
+        thrown = None
+        while True:
+            try:
+                if thrown is None:
+                    future = run(steps.send, sent)
+                else:
+                    future = run(steps.throw, thrown)
+            except StopIteration as stop:
+                return stop.value
+            sent = None
+            thrown = None
+            try:
+                sent = yield future
+            except BaseException as error:
+                thrown = error
+
+
+class Sampler:
+    """Pick the calls instrumented by a decorator.
+
+    A call is picked when all the conditions below hold. Calls not
+    picked go straight to the wrapped function. A sampler shared by
+    several decorators shares its budget between them.
+
+    Parameters
+    ----------
+    rate : float, optional
+        Probability of picking a call, by default 1.0.
+    every_n : int, optional
+        Pick one call out of every_n, starting with the first one, by
+        default 1.
+    max_per_second : float, optional
+        Pick at most this many calls per second, with a token bucket
+        allowing bursts of one second, by default None.
+    seed : int, optional
+        Seed of the random draws, for reproducible sampling, by default
+        None.
+
+    Raises
+    ------
+    ValueError
+        Raised if rate is not in [0, 1] or every_n is smaller than 1.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        every_n: int = 1,
+        max_per_second: Optional[float] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Sample rate {rate} not in [0, 1]!")
+        if every_n < 1:
+            raise ValueError(f"Sample every_n {every_n} smaller than 1!")
+
+        self.rate = rate
+        self.every_n = every_n
+        self.max_per_second = max_per_second
+        self._random = random.Random(seed).random
+        self._calls = itertools.count()
+        self._capacity = max(1.0, max_per_second or 0.0)
+        self._tokens = self._capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __call__(self) -> bool:
+        # next() on itertools.count is atomic under the GIL
+        if self.every_n > 1 and next(self._calls) % self.every_n:
+            return False
+        if self.rate < 1.0 and self._random() >= self.rate:
+            return False
+        if self.max_per_second is not None:
+            return self._take_token(self.max_per_second)
+        return True
+
+    def _take_token(self, per_second: float) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity,
+                self._tokens + (now - self._last) * per_second,
+            )
+            self._last = now
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+class _StreamProxy:
+    """Stand-in for sys.stdout or sys.stderr sending writes to a capture.
+
+    Each task or thread sees its own capture buffer through a context
+    variable, so concurrent threads and tasks never write into each
+    other's buffer. Writes made outside a capture go to the replaced
+    stream.
+
+    Parameters
+    ----------
+    stream : object
+        Replaced stream.
+    capture : ContextVar
+        Context variable holding the buffer of the current task.
+    """
+
+    def __init__(self, stream, capture: ContextVar) -> None:
+        self._stream = stream
+        self._capture = capture
+
+    def write(self, text: str) -> int:
+        buffer = self._capture.get()
+        return (self._stream if buffer is None else buffer).write(text)
+
+    def flush(self) -> None:
+        buffer = self._capture.get()
+        (self._stream if buffer is None else buffer).flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+@contextmanager
+def _capture_stream(name: str, buffer: TextIOBase):
+    """Capture what the current task writes to sys.stdout or sys.stderr.
+
+    Unlike redirect_stdout, the stream is replaced only once, by a proxy
+    shared by all the threads and tasks.
+
+    Parameters
+    ----------
+    name : str
+        "stdout" or "stderr".
+    buffer : object
+        Stream receiving the writes.
+    """
+    capture = _CAPTURE if name == "stdout" else _CAPTURE_STDERR
+    if not isinstance(getattr(sys, name), _StreamProxy):
+        with _LOGGERS_LOCK:
+            if not isinstance(getattr(sys, name), _StreamProxy):
+                setattr(sys, name, _StreamProxy(getattr(sys, name), capture))
+
+    token = capture.set(buffer)
+    try:
+        yield buffer
+    finally:
+        capture.reset(token)
+
+
+def _capture_stdout(buffer: TextIOBase):
+    """Capture the prints of the current task into a buffer."""
+    return _capture_stream("stdout", buffer)
+
+
 def signature(
     func_: None = None,
     level: str = "debug",
     console_log_level: str = CONSOLE_LOG_LEVEL,
     log_file_name: str = LOG_FILE_NAME,
     log_file_path: str = LOG_FILE_PATH,
+    once: bool = True,
+    sampler: Optional["Sampler"] = None,
 ) -> Union[Callable[[F], F], RuntimeWarning]:
     """Get function signature.
 
@@ -282,24 +1228,21 @@ def signature(
         Name of the log file, by default LOG_FILE_NAME.
     log_file_path : str, optional
         Path of the log file, by default LOG_FILE_PATH.
+    once : bool, optional
+        Log the signature on the first call only, since it never
+        changes, by default True.
+    sampler : Sampler, optional
+        Instrument only the calls picked by the sampler, by default None
+        for every call.
     """
 
     def _decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            log_level = _get_log_level(
-                level, console_log_level, log_file_name, log_file_path
-            )
-
-            log_level(f"Method's name: {func.__name__}")
-            log_level(f"Method's signature: {str(inspect.signature(func))}")
-
-            # Call the function as usual
-            output = func(*args, **kwargs)
-
-            return output
+        # Resolve logger and level method once, at decoration time
+        log_level = _get_log_level(
+            level, console_log_level, log_file_name, log_file_path
+        )
 
-        return wrapper
+        return _wrap(func, log_level, _signature_probe(func, once), sampler)
 
     if callable(func_):
         return _decorator(func_)
@@ -309,15 +1252,50 @@ def signature(
         raise RuntimeWarning("Positional arguments are not supported!")
 
 
+def _signature_probe(func: Callable, once: bool = True) -> Callable:
+    """Build the probe logging the name and signature of a function."""
+
+    name_msg = f"Method's name: {func.__name__}"
+    name_extra = _extra(func, "signature")
+    signature = _get_signature(func)
+    signature_msg = f"Method's signature: {signature.text}"
+    signature_extra = _extra(
+        func,
+        "signature",
+        signature=signature.text,
+        parameters=signature.parameters,
+    )
+    # The first call takes 0, the check is atomic under the GIL
+    calls = itertools.count()
+
+    def probe(log, args, kwargs):
+        if not once or next(calls) == 0:
+            log(name_msg, extra=name_extra)
+            log(signature_msg, extra=signature_extra)
+
+        # Call the function as usual
+        yield
+
+    return probe
+
+
 def arguments(
     func_: None = None,
     level: str = "debug",
     console_log_level: str = CONSOLE_LOG_LEVEL,
     log_file_name: str = LOG_FILE_NAME,
     log_file_path: str = LOG_FILE_PATH,
+    max_items: int = 10,
+    max_length: int = 100,
+    max_depth: int = 4,
+    sampler: Optional["Sampler"] = None,
 ) -> Union[Callable[[F], F], RuntimeWarning]:
     """Get args and kwargs.
 
+    Arguments are rendered with a bounded repr, and only when a handler
+    writes the record. Arrays and data frames are summarised by their
+    shape and dtype, long bytes by their length.
+
     Parameters
     ----------
     func_ : None, optional
@@ -331,25 +1309,26 @@ def arguments(
         Name of the log file, by default LOG_FILE_NAME.
     log_file_path : str, optional
         Path of the log file, by default LOG_FILE_PATH.
+    max_items : int, optional
+        Items shown per list, tuple, set or dict, by default 10.
+    max_length : int, optional
+        Characters shown per string or other value, by default 100.
+    max_depth : int, optional
+        Nested containers shown, by default 4.
+    sampler : Sampler, optional
+        Instrument only the calls picked by the sampler, by default None
+        for every call.
     """
 
     def _decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            log_level = _get_log_level(
-                level, console_log_level, log_file_name, log_file_path
-            )
+        # Resolve logger and level method once, at decoration time
+        log_level = _get_log_level(
+            level, console_log_level, log_file_name, log_file_path
+        )
 
-            log_level(f"Method's name: {func.__name__}")
-            log_level(f"Method's args: {args}")
-            log_level(f"Method's kwargs: {kwargs}")
-
-            # Call the function as usual
-            output = func(*args, **kwargs)
-
-            return output
-
-        return wrapper
+        renderer = _ArgRepr(max_items, max_length, max_depth)
+        probe = _arguments_probe(func, renderer)
+        return _wrap(func, log_level, probe, sampler)
 
     if callable(func_):
         return _decorator(func_)
@@ -359,12 +1338,152 @@ def arguments(
         raise RuntimeWarning("Positional arguments are not supported!")
 
 
+def _arguments_probe(
+    func: Callable, renderer: Optional["_ArgRepr"] = None
+) -> Callable:
+    """Build the probe logging the args and kwargs of a call."""
+
+    renderer = _ARG_REPR if renderer is None else renderer
+    name_msg = f"Method's name: {func.__name__}"
+    name_extra = _extra(func, "arguments")
+
+    def probe(log, args, kwargs):
+        log(name_msg, extra=name_extra)
+        args = _Rendered(args, renderer)
+        kwargs = _Rendered(kwargs, renderer)
+        log(
+            "Method's args: %s",
+            args,
+            extra=_extra(func, "arguments", args=args),
+        )
+        log(
+            "Method's kwargs: %s",
+            kwargs,
+            extra=_extra(func, "arguments", kwargs=kwargs),
+        )
+
+        # Call the function as usual
+        yield
+
+    return probe
+
+
+class _ArgRepr(reprlib.Repr):
+    """Bounded repr of the values logged by the decorators.
+
+    Parameters
+    ----------
+    max_items : int, optional
+        Items shown per container, by default 10.
+    max_length : int, optional
+        Characters shown per string or other value, by default 100.
+    max_depth : int, optional
+        Nested containers shown, by default 4.
+    """
+
+    def __init__(
+        self, max_items: int = 10, max_length: int = 100, max_depth: int = 4
+    ) -> None:
+        super().__init__()
+        self.maxlevel = max_depth
+        self.maxtuple = self.maxlist = self.maxarray = max_items
+        self.maxdict = self.maxset = self.maxfrozenset = max_items
+        self.maxdeque = max_items
+        self.maxstring = self.maxlong = self.maxother = max_length
+
+    def repr1(self, x: Any, level: int) -> str:
+        summary = self.summarize(x)
+        if summary is not None:
+            return summary
+
+        text = super().repr1(x, level)
+        if (
+            isinstance(x, (list, tuple, dict, set, frozenset))
+            and len(x) > self.maxlist
+        ):
+            text += f" (len={len(x)})"
+        return text
+
+    def summarize(self, x: Any) -> Optional[str]:
+        """Describe arrays, data frames and long buffers in constant time."""
+        shape = getattr(x, "shape", None)
+        if isinstance(shape, tuple):
+            dtype = getattr(x, "dtype", None)
+            if dtype is not None:
+                return f"{type(x).__name__}(shape={shape}, dtype={dtype})"
+            if hasattr(x, "dtypes"):
+                return f"{type(x).__name__}(shape={shape})"
+        if isinstance(x, (bytes, bytearray, memoryview)) and (
+            len(x) > self.maxstring
+        ):
+            return f"{type(x).__name__}(len={len(x)})"
+        return None
+
+
+# Renderer used when a decorator has no limits of its own
+_ARG_REPR = _ArgRepr()
+
+
+class _Rendered:
+    """Value rendered by an _ArgRepr only when a record is formatted.
+
+    Passed as a logging argument, so nothing is rendered for records no
+    handler writes.
+    """
+
+    __slots__ = ("value", "renderer")
+
+    def __init__(self, value: Any, renderer: _ArgRepr = _ARG_REPR) -> None:
+        self.value = value
+        self.renderer = renderer
+
+    def __str__(self) -> str:
+        return self.renderer.repr(self.value)
+
+    __repr__ = __str__
+
+    def plain(self) -> Any:
+        """Return a bounded copy made of JSON types, for structured records."""
+        return _plain(self.value, self.renderer, 0)
+
+
+def _plain(value: Any, renderer: _ArgRepr, level: int) -> Any:
+    """Convert a value to bounded JSON types, see _Rendered.plain."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        if len(value) > renderer.maxstring:
+            return renderer.repr(value)
+        return value
+    if level >= renderer.maxlevel or renderer.summarize(value) is not None:
+        return renderer.repr(value)
+
+    if isinstance(value, (list, tuple)):
+        items = [
+            _plain(item, renderer, level + 1)
+            for item in itertools.islice(value, renderer.maxlist)
+        ]
+        if len(value) > renderer.maxlist:
+            items.append(f"... (len={len(value)})")
+        return items
+    if isinstance(value, dict):
+        mapping = {
+            str(key): _plain(item, renderer, level + 1)
+            for key, item in itertools.islice(value.items(), renderer.maxdict)
+        }
+        if len(value) > renderer.maxdict:
+            mapping["..."] = f"(len={len(value)})"
+        return mapping
+    return renderer.repr(value)
+
+
 def description(
     func_: None = None,
     level: str = "debug",
     console_log_level: str = CONSOLE_LOG_LEVEL,
     log_file_name: str = LOG_FILE_NAME,
     log_file_path: str = LOG_FILE_PATH,
+    sampler: Optional["Sampler"] = None,
 ) -> Union[Callable[[F], F], RuntimeWarning]:
     """Describe function by pulling __doc__ string.
 
@@ -381,6 +1500,9 @@ def description(
         Name of the log file, by default LOG_FILE_NAME.
     log_file_path : str, optional
         Path of the log file, by default LOG_FILE_PATH.
+    sampler : Sampler, optional
+        Instrument only the calls picked by the sampler, by default None
+        for every call.
 
     Raises
     ------
@@ -389,20 +1511,12 @@ def description(
     """
 
     def _decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            log_level = _get_log_level(
-                level, console_log_level, log_file_name, log_file_path
-            )
-
-            log_level(f"Method's description: {func.__doc__}")
-
-            # Call the function as usual
-            output = func(*args, **kwargs)
+        # Resolve logger and level method once, at decoration time
+        log_level = _get_log_level(
+            level, console_log_level, log_file_name, log_file_path
+        )
 
-            return output
-
-        return wrapper
+        return _wrap(func, log_level, _description_probe(func), sampler)
 
     if callable(func_):
         return _decorator(func_)
@@ -412,6 +1526,21 @@ def description(
         raise RuntimeWarning("Positional arguments are not supported!")
 
 
+def _description_probe(func: Callable) -> Callable:
+    """Build the probe logging the docstring of a function."""
+
+    description_msg = f"Method's description: {func.__doc__}"
+    description_extra = _extra(func, "description", doc=func.__doc__)
+
+    def probe(log, args, kwargs):
+        log(description_msg, extra=description_extra)
+
+        # Call the function as usual
+        yield
+
+    return probe
+
+
 def _get_mem(unit: str, value: float) -> Union[Tuple[float, str], TypeError]:
     """Get memory formatting given the unit.
 
@@ -427,17 +1556,153 @@ def _get_mem(unit: str, value: float) -> Union[Tuple[float, str], TypeError]:
     float
         Amount of memory used in the chosen unit.
     """
+    return _get_mem_bytes(_get_size(value), unit)
 
-    if unit.lower() == "bytes":
-        return asizeof(value), "bytes"
-    elif unit.lower() == "mb":
-        return asizeof(value) / 1.0e6, "MBs"
-    elif unit.lower() == "gb":
-        return asizeof(value) / 1.0e9, "GBs"
-    elif unit.lower() == "tb":
-        return asizeof(value) / 1.0e12, "TBs"
-    else:
-        raise TypeError(f"Memory unit level {unit} not known!")
+
+def register_size_estimator(
+    cls: type, estimator: Callable[[Any], int]
+) -> None:
+    """Tell @memory how to size the instances of a type.
+
+    Estimators are looked up along the method resolution order of the
+    measured value, so one registered for a base class covers its
+    subclasses.
+
+    Parameters
+    ----------
+    cls : type
+        Type of the values measured by the estimator.
+    estimator : Callable
+        Return the size in bytes of a value.
+    """
+    with _SIZE_LOCK:
+        _SIZE_ESTIMATORS[cls] = estimator
+        _SIZE_DISPATCH.clear()
+
+
+def _get_size(value: Any) -> int:
+    """Estimate the size in bytes of a value.
+
+    Buffers, strings, arrays and data frames are sized in constant time.
+    Other values are walked by pympler up to _SIZE_DEPTH references
+    deep.
+    """
+    cls = type(value)
+    estimator = _SIZE_DISPATCH.get(cls)
+    if estimator is None:
+        estimator = _find_size_estimator(value)
+        _SIZE_DISPATCH[cls] = estimator
+    return estimator(value)
+
+
+def _find_size_estimator(value: Any) -> Callable[[Any], int]:
+    """Pick the estimator sizing the type of a value."""
+    for cls in type(value).__mro__:
+        if cls in _SIZE_ESTIMATORS:
+            return _SIZE_ESTIMATORS[cls]
+
+    # Duck typing keeps numpy and pandas optional
+    if isinstance(getattr(value, "nbytes", None), int) and hasattr(
+        value, "dtype"
+    ):
+        return _nbytes_size
+    if callable(getattr(value, "memory_usage", None)) and hasattr(
+        value, "dtypes"
+    ):
+        return _memory_usage_size
+    return _asizeof
+
+
+def _nbytes_size(value: Any) -> int:
+    """Size of the data of an array."""
+    return value.nbytes
+
+
+def _memory_usage_size(value: Any) -> int:
+    """Size of a pandas Series or DataFrame."""
+    usage = value.memory_usage(deep=True)
+    return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+
+
+def _buffer_size(value: memoryview) -> int:
+    """Size of a memoryview: the viewed buffer plus the view."""
+    return value.nbytes + getsizeof(value)
+
+
+def _asizeof(value: Any) -> int:
+    """Size of any value, walking the objects it refers to."""
+    # Heavy import (pympler loads numpy), done on first use
+    from pympler.asizeof import asizeof  # type: ignore
+
+    return asizeof(value, limit=_SIZE_DEPTH)
+
+
+_SIZE_ESTIMATORS.update(
+    {
+        bytes: getsizeof,
+        bytearray: getsizeof,
+        str: getsizeof,
+        int: getsizeof,
+        float: getsizeof,
+        complex: getsizeof,
+        type(None): getsizeof,
+        memoryview: _buffer_size,
+    }
+)
+
+
+def _get_mem_bytes(
+    nbytes: int, unit: str
+) -> Union[Tuple[float, str], TypeError]:
+    """Convert a number of bytes to the chosen unit.
+
+    Parameters
+    ----------
+    nbytes : int
+        Amount of memory in bytes.
+    unit : str
+        Unit of memory: "bytes", "mb", "gb" or "tb".
+
+    Returns
+    -------
+    tuple
+        Amount of memory in the chosen unit and the unit label.
+
+    Raises
+    ------
+    TypeError
+        Raised if the unit is not known.
+    """
+    try:
+        scale, label = _MEM_UNITS[unit.lower()]
+    except KeyError:
+        raise TypeError(f"Memory unit level {unit} not known!") from None
+    if scale == 1:
+        return nbytes, label
+    return nbytes / scale, label
+
+
+def _start_tracemalloc():
+    """Start tracing allocations once and keep tracing between calls."""
+    global _TRACEMALLOC_STARTED
+
+    # Imported on first use to keep pyDecLog import fast
+    import tracemalloc
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _TRACEMALLOC_STARTED = True
+    return tracemalloc
+
+
+def _stop_tracemalloc() -> None:
+    """Stop tracing allocations if @memory started it."""
+    global _TRACEMALLOC_STARTED
+    if _TRACEMALLOC_STARTED:
+        import tracemalloc
+
+        tracemalloc.stop()
+        _TRACEMALLOC_STARTED = False
 
 
 def memory(
@@ -447,6 +1712,10 @@ def memory(
     console_log_level: str = CONSOLE_LOG_LEVEL,
     log_file_name: str = LOG_FILE_NAME,
     log_file_path: str = LOG_FILE_PATH,
+    allocations: bool = False,
+    top: int = 0,
+    rss: bool = False,
+    sampler: Optional["Sampler"] = None,
 ) -> Union[Callable[[F], F], RuntimeWarning]:
     """Profile local variables memory.
 
@@ -464,45 +1733,42 @@ def memory(
         Name of the log file, by default LOG_FILE_NAME.
     log_file_path : str, optional
         Path of the log file, by default LOG_FILE_PATH.
+    allocations : bool, optional
+        Also log the memory allocated by the call and its peak, traced
+        with tracemalloc. Tracing starts on the first call and keeps
+        running, and peaks of calls running at the same time in other
+        threads overlap, by default False.
+    top : int, optional
+        With allocations, also log the top source lines allocating
+        memory during the call. Costs two snapshots per call, by default
+        0.
+    rss : bool, optional
+        Also log the change of resident set size of the process, by
+        default False.
+    sampler : Sampler, optional
+        Instrument only the calls picked by the sampler, by default None
+        for every call.
 
     Raises
     ------
     RunTimeWarning
         Raise if called with positional arguments.
+    TypeError
+        Raised if the unit is not known, or if allocations are asked for
+        before Python 3.9.
     """
 
     def _decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            log_level = _get_log_level(
-                level, console_log_level, log_file_name, log_file_path
-            )
-
-            log_level(f"Function signature: {inspect.signature(func)}")
-
-            for arg in args:
-                arg_size = getsizeof(arg)
-                mem_value, mem_unit = _get_mem(unit, arg_size)
-
-                log_level(
-                    f"Size of argument {str(arg)[:10]}: {mem_value} {mem_unit}"
-                )
-
-            # Check size of keyword arguments
-            for key, value in kwargs.items():
-                mem_value, mem_unit = _get_mem(unit, value)
-                log_level(
-                    f"Size of keyword argument '{str(key)[:10]}: {mem_value} {mem_unit}"
-                )
-
-            # Call the decorated function
-            output = func(*args, **kwargs)
-
-            log_level(f"Size of output: {getsizeof(output)} {mem_unit}")
+        # Resolve logger and level method once, at decoration time
+        log_level = _get_log_level(
+            level, console_log_level, log_file_name, log_file_path
+        )
 
-            return output
+        # Fail at decoration time for unknown units
+        _get_mem_bytes(0, unit)
 
-        return wrapper
+        probe = _memory_probe(func, unit, allocations, top, rss)
+        return _wrap(func, log_level, probe, sampler)
 
     if callable(func_):
         return _decorator(func_)
@@ -512,12 +1778,136 @@ def memory(
         raise RuntimeWarning("Positional arguments are not supported!")
 
 
-def typing(
-    func_: None = None,
-    level: str = "debug",
+def _memory_probe(
+    func: Callable,
+    unit: str,
+    allocations: bool = False,
+    top: int = 0,
+    rss: bool = False,
+) -> Callable:
+    """Build the probe logging the size of the args, kwargs and output."""
+
+    if allocations and sys.version_info < (3, 9):
+        # tracemalloc.reset_peak is new in Python 3.9
+        raise TypeError("Memory allocations need Python 3.9!")
+    if rss:
+        # Fails now if psutil is missing
+        _get_process()
+
+    signature = _get_signature(func).text
+    signature_msg = f"Function signature: {signature}"
+    signature_extra = _extra(func, "memory", signature=signature)
+
+    def probe(log, args, kwargs):
+        log(signature_msg, extra=signature_extra)
+
+        for index, arg in enumerate(args):
+            mem_value, mem_unit = _get_mem(unit, arg)
+
+            log(
+                f"Size of argument {_ARG_REPR.repr(arg)[:10]}: {mem_value} {mem_unit}",
+                extra=_extra(
+                    func,
+                    "memory",
+                    arg=index,
+                    size=mem_value,
+                    unit=mem_unit,
+                ),
+            )
+
+        # Check size of keyword arguments
+        for key, value in kwargs.items():
+            mem_value, mem_unit = _get_mem(unit, value)
+            log(
+                f"Size of keyword argument '{str(key)[:10]}: {mem_value} {mem_unit}",
+                extra=_extra(
+                    func,
+                    "memory",
+                    kwarg=key,
+                    size=mem_value,
+                    unit=mem_unit,
+                ),
+            )
+
+        # Tracing starts on the first instrumented call, not when the
+        # function is decorated
+        tracemalloc = _start_tracemalloc() if allocations else None
+        if tracemalloc is not None:
+            if top:
+                snapshot = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            traced_start, _ = tracemalloc.get_traced_memory()
+        if rss:
+            process = _get_process()
+            rss_start = process.memory_info().rss
+
+        # Call the decorated function
+        output = yield
+
+        if tracemalloc is not None:
+            traced_end, traced_peak = tracemalloc.get_traced_memory()
+            allocated, mem_unit = _get_mem_bytes(
+                traced_end - traced_start, unit
+            )
+            peak, _ = _get_mem_bytes(traced_peak - traced_start, unit)
+            log(
+                f"Memory allocated: {allocated} {mem_unit} | peak: {peak} {mem_unit}",
+                extra=_extra(
+                    func,
+                    "memory",
+                    allocated=traced_end - traced_start,
+                    peak=traced_peak - traced_start,
+                ),
+            )
+            if top:
+                stats = tracemalloc.take_snapshot().compare_to(
+                    snapshot, "lineno"
+                )
+                # Leave out the memory used by the snapshots themselves
+                frames = [
+                    (stat, stat.traceback[0])
+                    for stat in stats
+                    if stat.traceback[0].filename != tracemalloc.__file__
+                ]
+                for stat, frame in frames[:top]:
+                    size, mem_unit = _get_mem_bytes(stat.size_diff, unit)
+                    log(
+                        f"Allocated at {frame.filename}:{frame.lineno}: {size} {mem_unit}",
+                        extra=_extra(
+                            func,
+                            "memory",
+                            filename=frame.filename,
+                            lineno=frame.lineno,
+                            allocated=stat.size_diff,
+                        ),
+                    )
+
+        if rss:
+            rss_change = process.memory_info().rss - rss_start
+            size, mem_unit = _get_mem_bytes(rss_change, unit)
+            log(
+                f"RSS change: {size} {mem_unit}",
+                extra=_extra(func, "memory", rss=rss_change),
+            )
+
+        mem_value, mem_unit = _get_mem(unit, output)
+        log(
+            f"Size of output: {mem_value} {mem_unit}",
+            extra=_extra(
+                func, "memory", output=True, size=mem_value, unit=mem_unit
+            ),
+        )
+
+    return probe
+
+
+def typing(
+    func_: None = None,
+    level: str = "debug",
     console_log_level: str = CONSOLE_LOG_LEVEL,
     log_file_name: str = LOG_FILE_NAME,
     log_file_path: str = LOG_FILE_PATH,
+    sampler: Optional["Sampler"] = None,
 ) -> Union[Callable[[F], F], RuntimeWarning]:
     """Profile local variable type.
 
@@ -535,6 +1925,9 @@ def typing(
         Name of the log file, by default LOG_FILE_NAME.
     log_file_path : str, optional
         Path of the log file, by default LOG_FILE_PATH.
+    sampler : Sampler, optional
+        Instrument only the calls picked by the sampler, by default None
+        for every call.
 
     Raises
     ------
@@ -543,29 +1936,12 @@ def typing(
     """
 
     def _decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            log_level = _get_log_level(
-                level, console_log_level, log_file_name, log_file_path
-            )
-
-            log_level(f"Function signature: {inspect.signature(func)}")
-
-            for arg in args:
-                log_level(f"Argument's type: {type(arg)}")
-
-            # Check size of keyword arguments
-            for key, _ in kwargs.items():
-                log_level(f"Size of keyword argument '{type(key)}")
-
-            # Call the decorated function
-            output = func(*args, **kwargs)
+        # Resolve logger and level method once, at decoration time
+        log_level = _get_log_level(
+            level, console_log_level, log_file_name, log_file_path
+        )
 
-            log_level(f"Type of output: {type(output)}")
-
-            return output
-
-        return wrapper
+        return _wrap(func, log_level, _typing_probe(func), sampler)
 
     if callable(func_):
         return _decorator(func_)
@@ -575,42 +1951,219 @@ def typing(
         raise RuntimeWarning("Positional arguments are not supported!")
 
 
+def _typing_probe(func: Callable) -> Callable:
+    """Build the probe logging the type of the args, kwargs and output."""
+
+    signature = _get_signature(func).text
+    signature_msg = f"Function signature: {signature}"
+    signature_extra = _extra(func, "typing", signature=signature)
+
+    def probe(log, args, kwargs):
+        log(signature_msg, extra=signature_extra)
+
+        for index, arg in enumerate(args):
+            log(
+                f"Argument's type: {type(arg)}",
+                extra=_extra(
+                    func, "typing", arg=index, type=type(arg).__qualname__
+                ),
+            )
+
+        for key, value in kwargs.items():
+            log(
+                f"Keyword argument's type: {key}: {type(value)}",
+                extra=_extra(
+                    func, "typing", kwarg=key, type=type(value).__qualname__
+                ),
+            )
+
+        # Call the decorated function
+        output = yield
+
+        log(
+            f"Type of output: {type(output)}",
+            extra=_extra(
+                func, "typing", output=True, type=type(output).__qualname__
+            ),
+        )
+
+    return probe
+
+
 class profile_locals:
-    """Profile persistent local variables."""
+    """Profile persistent local variables.
+
+    The locals of the function are copied once, when it returns, and
+    kept in the locals attribute. On Python 3.12+ the return is caught
+    with sys.monitoring, which only fires for this function. Otherwise
+    a profile function is installed on the calling thread for the
+    duration of the call, then the previous one is restored.
+
+    Parameters
+    ----------
+    func : Callable
+        Profiled function.
+    backend : str, optional
+        "monitoring" or "profile", by default "monitoring" when
+        available.
+
+    Raises
+    ------
+    TypeError
+        Raised if the backend is not known or not available.
+    """
+
+    def __init__(self, func, backend: Optional[str] = None) -> None:
+        if backend is None:
+            backend = "monitoring" if hasattr(sys, "monitoring") else "profile"
+        if backend not in _PROFILE_BACKENDS:
+            raise TypeError(f"Profile backend {backend} not known!")
+        if backend == "monitoring" and not hasattr(sys, "monitoring"):
+            raise TypeError("Profile backend monitoring needs Python 3.12!")
 
-    def __init__(self, func) -> None:
         self._locals: Dict[str, Any] = {}
         self.func = func
+        self._code = getattr(func, "__code__", None)
+        # Calls in progress on each thread
+        self._state = threading.local()
+
+        if backend == "monitoring" and (
+            self._code is None
+            or not _monitor_returns(self._code, self._on_return)
+        ):
+            backend = "profile"
+        self.backend = backend
 
     def __call__(self, *args, **kwargs) -> Any:
+        if self.backend == "monitoring":
+            return self._call_monitored(args, kwargs)
+
+        previous = sys.getprofile()
+        if previous is not None and not callable(previous):
+            # A C profiler such as cProfile cannot be restored
+            return self.func(*args, **kwargs)
+
+        code = self._code
+        captured: List[Dict[str, Any]] = []
+
         def tracer(frame, event, arg):
-            if event == "return":
-                self._locals = frame.f_locals.copy()
+            if event == "return" and (code is None or frame.f_code is code):
+                captured[:] = [frame.f_locals.copy()]
+            if previous is not None:
+                previous(frame, event, arg)
 
-        # Tracer is activated on next call, return or exception
+        # Profile functions are per thread
         sys.setprofile(tracer)
         try:
-            # Trace the function call
             res = self.func(*args, **kwargs)
         finally:
-            # Disable tracer and replace with old one
-            sys.setprofile(None)
+            sys.setprofile(previous)
+
+        if captured:
+            self._locals = captured[0]
+        return res
+
+    def _call_monitored(self, args, kwargs) -> Any:
+        state = self._state
+        state.depth = getattr(state, "depth", 0) + 1
+        state.locals = None
+        try:
+            res = self.func(*args, **kwargs)
+        finally:
+            state.depth -= 1
+
+        if state.locals is not None:
+            self._locals = state.locals
         return res
 
+    def _on_return(self, frame) -> None:
+        # Only the threads calling through this wrapper are profiled
+        state = self._state
+        if getattr(state, "depth", 0):
+            state.locals = frame.f_locals.copy()
+
     @property
     def locals(self) -> Dict[str, Any]:
         return self._locals
 
 
+def _monitor_returns(code, handler: Callable) -> bool:
+    """Call handler with the frame whenever code returns.
+
+    Uses sys.monitoring local events, so other code runs at full speed.
+    The handler is a bound method, weakly referenced so the profile_locals
+    wrapper can be collected, and several wrappers may watch the same
+    code. Only the profiler id and the two ids without a set role are
+    used, never the ones of debuggers, coverage tools and optimizers.
+    Returns False if all of them are taken.
+    """
+    global _MONITORING_TOOL
+
+    monitoring = sys.monitoring  # type: ignore
+    with _PROFILE_LOCK:
+        if _MONITORING_TOOL is None:
+            for tool in (monitoring.PROFILER_ID, 3, 4):
+                if monitoring.get_tool(tool) is None:
+                    monitoring.use_tool_id(tool, "pyDecLog")
+                    break
+            else:
+                return False
+            monitoring.register_callback(
+                tool, monitoring.events.PY_RETURN, _on_monitored_return
+            )
+            _MONITORING_TOOL = tool
+
+        _MONITORED_RETURNS.setdefault(code, set()).add(
+            weakref.WeakMethod(
+                handler, lambda ref: _forget_monitored_return(code, ref)
+            )
+        )
+        monitoring.set_local_events(
+            _MONITORING_TOOL, code, monitoring.events.PY_RETURN
+        )
+    return True
+
+
+def _on_monitored_return(code, instruction_offset: int, retval: Any) -> None:
+    """sys.monitoring callback, called from the returning frame."""
+    handlers = _MONITORED_RETURNS.get(code)
+    if handlers:
+        frame = sys._getframe(1)
+        for ref in tuple(handlers):
+            handler = ref()
+            if handler is not None:
+                handler(frame)
+
+
+def _forget_monitored_return(code, ref: "weakref.WeakMethod") -> None:
+    """Drop a collected handler, and stop monitoring code without any."""
+    with _PROFILE_LOCK:
+        handlers = _MONITORED_RETURNS.get(code)
+        if handlers is None:
+            return
+        handlers.discard(ref)
+        if not handlers:
+            del _MONITORED_RETURNS[code]
+            sys.monitoring.set_local_events(  # type: ignore
+                _MONITORING_TOOL, code, 0
+            )
+
+
 def machine(
     func_: None = None,
     level: str = "debug",
     console_log_level: str = CONSOLE_LOG_LEVEL,
     log_file_name: str = LOG_FILE_NAME,
     log_file_path: str = LOG_FILE_PATH,
+    once: bool = True,
+    snapshot_every: Optional[float] = None,
+    resources: bool = False,
+    sampler: Optional["Sampler"] = None,
 ) -> Union[Callable[[F], F], RuntimeWarning]:
     """Profile local machine hardware.
 
+    The OS and hardware are queried once per process.
+
     Parameters
     ----------
     func_ : None, optional
@@ -623,6 +2176,21 @@ def machine(
         Name of the log file, by default LOG_FILE_NAME.
     log_file_path : str, optional
         Path of the log file, by default LOG_FILE_PATH.
+    once : bool, optional
+        Log the OS and hardware on the first call only, since they never
+        change, by default True.
+    snapshot_every : float, optional
+        Also log the load average, available RAM, CPU frequency, process
+        RSS and open file descriptors on every call, as sampled by a
+        background thread every snapshot_every seconds, by default None.
+    resources : bool, optional
+        Also log the resources used by the process during the call: user
+        and system CPU time, context switches, page faults and bytes read
+        and written. Counters are process-wide, so calls running at the
+        same time in other threads are included, by default False.
+    sampler : Sampler, optional
+        Instrument only the calls picked by the sampler, by default None
+        for every call.
 
     Raises
     ------
@@ -631,26 +2199,13 @@ def machine(
     """
 
     def _decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            log_level = _get_log_level(
-                level, console_log_level, log_file_name, log_file_path
-            )
+        # Resolve logger and level method once, at decoration time
+        log_level = _get_log_level(
+            level, console_log_level, log_file_name, log_file_path
+        )
 
-            log_level(f"Platform: {platform.platform()}")
-            log_level(f"System: {platform.system()}")
-            log_level(f"Release: {platform.release()}")
-            log_level(f"Version: {platform.version()}")
-            log_level(f"No LOGICAL CPUs? {psutil.cpu_count(logical=True)}")
-            log_level(f"No PHYSICAL CPUs? {psutil.cpu_count(logical=False)}")
-            log_level(f"RAM {psutil.virtual_memory().total/1.e9} [Gb]")
-
-            # Call the decorated function
-            output = func(*args, **kwargs)
-
-            return output
-
-        return wrapper
+        probe = _machine_probe(func, once, snapshot_every, resources)
+        return _wrap(func, log_level, probe, sampler)
 
     if callable(func_):
         return _decorator(func_)
@@ -660,12 +2215,263 @@ def machine(
         raise RuntimeWarning("Positional arguments are not supported!")
 
 
+def _machine_probe(
+    func: Callable,
+    once: bool = True,
+    snapshot_every: Optional[float] = None,
+    resources: bool = False,
+) -> Callable:
+    """Build the probe logging the OS and hardware of the machine."""
+
+    # The first call takes 0, the check is atomic under the GIL
+    calls = itertools.count()
+    if snapshot_every is not None:
+        # Started now, looked up on each call since a forked child or
+        # reset() needs a new one
+        _get_machine_monitor(snapshot_every)
+    usage = _get_usage_reader() if resources else None
+
+    def probe(log, args, kwargs):
+        if not once or next(calls) == 0:
+            facts = _get_machine_facts()
+            extra = _extra(func, "machine", **facts)
+
+            log(f"Platform: {facts['platform']}", extra=extra)
+            log(f"System: {facts['system']}", extra=extra)
+            log(f"Release: {facts['release']}", extra=extra)
+            log(f"Version: {facts['version']}", extra=extra)
+            log(f"No LOGICAL CPUs? {facts['logical_cpus']}", extra=extra)
+            log(f"No PHYSICAL CPUs? {facts['physical_cpus']}", extra=extra)
+            log(f"RAM {facts['ram_gb']} [Gb]", extra=extra)
+
+        if snapshot_every is not None:
+            snapshot = _get_machine_monitor(snapshot_every).snapshot
+            log(
+                f"Load average: {snapshot['load_average']}"
+                f" | available RAM: {snapshot['available_ram_gb']} [Gb]"
+                f" | CPU frequency: {snapshot['cpu_mhz']} [MHz]"
+                f" | RSS: {snapshot['rss_mb']} [Mb]"
+                f" | open fds: {snapshot['open_fds']}",
+                extra=_extra(func, "machine_snapshot", **snapshot),
+            )
+
+        if usage is None:
+            # Call the decorated function
+            yield
+            return
+
+        start = usage()
+        yield
+        used = {key: value - start[key] for key, value in usage().items()}
+
+        log(
+            f"Resources used: user CPU {round(used['user_time'], 6)} sec"
+            f" | system CPU {round(used['system_time'], 6)} sec"
+            f" | context switches {used['voluntary_switches']} voluntary,"
+            f" {used['involuntary_switches']} involuntary"
+            f" | page faults {used['major_faults']} major,"
+            f" {used['minor_faults']} minor"
+            f" | read {used['read_bytes']} bytes"
+            f" | written {used['write_bytes']} bytes",
+            extra=_extra(func, "resources", **used),
+        )
+
+    return probe
+
+
+def _get_process() -> Any:
+    """Return the psutil handle of the current process.
+
+    Made once per process: a forked child must not read the counters of
+    its parent, see _forget_process.
+    """
+    global _PROCESS
+
+    if _PROCESS is None:
+        # Imported on first use to keep pyDecLog import fast
+        import psutil
+
+        _PROCESS = psutil.Process()
+    return _PROCESS
+
+
+def _forget_process() -> None:
+    """Make a new psutil handle in a forked child, whose pid differs."""
+    global _PROCESS
+    _PROCESS = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_process)
+
+
+def _get_usage_reader() -> Callable[[], Dict[str, float]]:
+    """Return a function reading the resource counters of the process.
+
+    getrusage costs a single system call. Platforms without the resource
+    module, such as Windows, read the same counters with psutil.
+    """
+    try:
+        # Imported on first use to keep pyDecLog import fast
+        import resource
+    except ImportError:
+        return _get_psutil_usage_reader()
+
+    def usage() -> Dict[str, float]:
+        rusage = resource.getrusage(resource.RUSAGE_SELF)
+        return {
+            "user_time": rusage.ru_utime,
+            "system_time": rusage.ru_stime,
+            "voluntary_switches": rusage.ru_nvcsw,
+            "involuntary_switches": rusage.ru_nivcsw,
+            "major_faults": rusage.ru_majflt,
+            "minor_faults": rusage.ru_minflt,
+            # Counted in blocks of 512 bytes
+            "read_bytes": rusage.ru_inblock * 512,
+            "write_bytes": rusage.ru_oublock * 512,
+        }
+
+    return usage
+
+
+def _get_psutil_usage_reader() -> Callable[[], Dict[str, float]]:
+    """Return a function reading the resource counters with psutil."""
+    # Fails now if psutil is missing
+    _get_process()
+
+    def usage() -> Dict[str, float]:
+        process = _get_process()
+        cpu = process.cpu_times()
+        switches = process.num_ctx_switches()
+        io = process.io_counters()
+        return {
+            "user_time": cpu.user,
+            "system_time": cpu.system,
+            "voluntary_switches": switches.voluntary,
+            "involuntary_switches": switches.involuntary,
+            "major_faults": 0,
+            "minor_faults": getattr(
+                process.memory_info(), "num_page_faults", 0
+            ),
+            "read_bytes": io.read_bytes,
+            "write_bytes": io.write_bytes,
+        }
+
+    return usage
+
+
+def _get_machine_facts() -> Dict[str, Any]:
+    """Return the OS and hardware of the machine, queried once."""
+    global _MACHINE_FACTS
+
+    if _MACHINE_FACTS is None:
+        # Imported on first use to keep pyDecLog import fast
+        import psutil
+
+        _MACHINE_FACTS = {
+            "platform": platform.platform(),
+            "system": platform.system(),
+            "release": platform.release(),
+            "version": platform.version(),
+            "logical_cpus": psutil.cpu_count(logical=True),
+            "physical_cpus": psutil.cpu_count(logical=False),
+            "ram_gb": psutil.virtual_memory().total / 1.0e9,
+        }
+    return _MACHINE_FACTS
+
+
+class _MachineMonitor(threading.Thread):
+    """Daemon thread sampling the load of the machine.
+
+    Decorated calls read the last snapshot instead of querying the
+    system themselves.
+
+    Parameters
+    ----------
+    interval : float
+        Seconds between two snapshots.
+    """
+
+    def __init__(self, interval: float) -> None:
+        super().__init__(name="pyDecLog-machine", daemon=True)
+        # Imported on first use to keep pyDecLog import fast
+        import psutil
+
+        self.interval = interval
+        self._psutil = psutil
+        self._process = psutil.Process()
+        self._stopped = threading.Event()
+        self.snapshot = self._sample()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.snapshot = self._sample()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _sample(self) -> Dict[str, Any]:
+        psutil = self._psutil
+        frequency = psutil.cpu_freq() if hasattr(psutil, "cpu_freq") else None
+        return {
+            "load_average": (
+                os.getloadavg() if hasattr(os, "getloadavg") else None
+            ),
+            "available_ram_gb": psutil.virtual_memory().available / 1.0e9,
+            "cpu_mhz": None if frequency is None else frequency.current,
+            "rss_mb": self._process.memory_info().rss / 1.0e6,
+            "open_fds": (
+                self._process.num_fds()
+                if hasattr(self._process, "num_fds")
+                else self._process.num_handles()
+            ),
+        }
+
+
+def _get_machine_monitor(interval: float) -> _MachineMonitor:
+    """Return the running monitor sampling every interval seconds."""
+    monitor = _MACHINE_MONITORS.get(interval)
+    if monitor is not None:
+        return monitor
+
+    with _MACHINE_LOCK:
+        monitor = _MACHINE_MONITORS.get(interval)
+        if monitor is None or not monitor.is_alive():
+            monitor = _MachineMonitor(interval)
+            monitor.start()
+            _MACHINE_MONITORS[interval] = monitor
+    return monitor
+
+
+def _stop_machine_monitors() -> None:
+    """Stop the threads sampling the machine load."""
+    with _MACHINE_LOCK:
+        for monitor in _MACHINE_MONITORS.values():
+            monitor.stop()
+        _MACHINE_MONITORS.clear()
+
+
+def _forget_machine_monitors() -> None:
+    """Start new monitors in a forked child, the threads do not survive.
+
+    They sample the process they were started in, the parent.
+    """
+    global _MACHINE_LOCK
+    _MACHINE_LOCK = threading.Lock()
+    _MACHINE_MONITORS.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_machine_monitors)
+
+
 def user(
     func_: None = None,
     level: str = "debug",
     console_log_level: str = CONSOLE_LOG_LEVEL,
     log_file_name: str = LOG_FILE_NAME,
     log_file_path: str = LOG_FILE_PATH,
+    sampler: Optional["Sampler"] = None,
 ) -> Union[Callable[[F], F], RuntimeWarning]:
     """Profile local machine hardware.
 
@@ -681,6 +2487,9 @@ def user(
         Name of the log file, by default LOG_FILE_NAME.
     log_file_path : str, optional
         Path of the log file, by default LOG_FILE_PATH.
+    sampler : Sampler, optional
+        Instrument only the calls picked by the sampler, by default None
+        for every call.
 
     Raises
     ------
@@ -689,20 +2498,136 @@ def user(
     """
 
     def _decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            log_level = _get_log_level(
-                level, console_log_level, log_file_name, log_file_path
-            )
+        # Resolve logger and level method once, at decoration time
+        log_level = _get_log_level(
+            level, console_log_level, log_file_name, log_file_path
+        )
 
-            log_level(f"User: {os.getlogin()}")
+        return _wrap(func, log_level, _user_probe(func), sampler)
 
-            # Call the decorated function
-            output = func(*args, **kwargs)
+    if callable(func_):
+        return _decorator(func_)
+    elif func_ is None:
+        return _decorator
+    else:
+        raise RuntimeWarning("Positional arguments are not supported!")
 
-            return output
 
-        return wrapper
+def _user_probe(func: Callable) -> Callable:
+    """Build the probe logging the user running the process."""
+
+    def probe(log, args, kwargs):
+        message, fields = _get_user_identity()
+        log(message, extra=_extra(func, "user", **fields))
+
+        # Call the decorated function
+        yield
+
+    return probe
+
+
+def instrument(
+    func_: None = None,
+    aspects: Tuple[str, ...] = ("timing",),
+    level: str = "debug",
+    console_log_level: str = CONSOLE_LOG_LEVEL,
+    log_file_name: str = LOG_FILE_NAME,
+    log_file_path: str = LOG_FILE_PATH,
+    unit: str = "sec",
+    cpu_time: bool = False,
+    memory_unit: str = "bytes",
+    sampler: Optional["Sampler"] = None,
+) -> Union[Callable[[F], F], RuntimeWarning]:
+    """Combine several decorators in one wrapper logging one record.
+
+    @instrument(aspects=("description", "signature", "arguments",
+    "timing", "message")) behaves like the same decorators stacked in
+    this order, but each call goes through a single wrapper and the
+    lines of every aspect are joined into one record.
+
+    Parameters
+    ----------
+    func_ : None, optional
+        Wrapped function, by default None.
+    aspects : tuple, optional
+        Names of the decorators to combine, outermost first:
+        "arguments", "description", "machine", "memory", "message",
+        "signature", "timing", "typing" or "user", by default
+        ("timing",).
+    level : str, optional
+        Log level: "debug", "info", "critical" or "error", by default "debug".
+    console_log_level : str, optional
+        Console log level. Same options as log level, by default CONSOLE_LOG_LEVEL.
+    log_file_name : str, optional
+        Name of the log file, by default LOG_FILE_NAME.
+    log_file_path : str, optional
+        Path of the log file, by default LOG_FILE_PATH.
+    unit : str, optional
+        Unit of time of the "timing" aspect, by default "sec".
+    cpu_time : bool, optional
+        Also log the CPU time in the "timing" aspect, by default False.
+    memory_unit : str, optional
+        Unit of memory of the "memory" aspect, by default "bytes".
+    sampler : Sampler, optional
+        Instrument only the calls picked by the sampler, by default None
+        for every call.
+
+    Raises
+    ------
+    RunTimeWarning
+        Raise if called with positional arguments.
+    TypeError
+        Raised if an aspect is not known.
+    """
+
+    for aspect in aspects:
+        if aspect not in _ASPECTS:
+            raise TypeError(f"Aspect {aspect} not known!")
+
+    def _decorator(func):
+        # Resolve logger and level method once, at decoration time
+        log_level = _get_log_level(
+            level, console_log_level, log_file_name, log_file_path
+        )
+
+        # Fail at decoration time for unknown units
+        _get_time_ns(0, unit)
+        _get_mem_bytes(0, memory_unit)
+
+        probes = [
+            _aspect_probe(aspect, func, unit, cpu_time, memory_unit)
+            for aspect in aspects
+        ]
+
+        def probe(log, args, kwargs):
+            lines = []
+            records = []
+
+            def collect(msg, *args, extra=None):
+                lines.append(msg % args if args else msg)
+                if extra is not None:
+                    records.append(extra["pydeclog"])
+
+            steps = [p(collect, args, kwargs) for p in probes]
+            for step in steps:
+                next(step)
+
+            try:
+                output = yield
+            except GeneratorExit:
+                for step in reversed(steps):
+                    step.close()
+                raise
+
+            for step in reversed(steps):
+                _resume(step, output)
+
+            log(
+                " | ".join(lines),
+                extra=_extra(func, "instrument", records=records),
+            )
+
+        return _wrap(func, log_level, probe, sampler)
 
     if callable(func_):
         return _decorator(func_)
@@ -712,12 +2637,123 @@ def user(
         raise RuntimeWarning("Positional arguments are not supported!")
 
 
+def _aspect_probe(
+    aspect: str, func: Callable, unit: str, cpu_time: bool, memory_unit: str
+) -> Callable:
+    """Build the probe of one of the aspects of @instrument."""
+    if aspect == "arguments":
+        return _arguments_probe(func)
+    elif aspect == "description":
+        return _description_probe(func)
+    elif aspect == "machine":
+        return _machine_probe(func)
+    elif aspect == "memory":
+        return _memory_probe(func, memory_unit)
+    elif aspect == "message":
+        return _message_probe(func)
+    elif aspect == "signature":
+        return _signature_probe(func)
+    elif aspect == "timing":
+        return _timing_probe(func, unit, cpu_time)
+    elif aspect == "typing":
+        return _typing_probe(func)
+    elif aspect == "user":
+        return _user_probe(func)
+    else:
+        raise TypeError(f"Aspect {aspect} not known!")
+
+
+def _get_user_identity() -> Tuple[str, Dict[str, Any]]:
+    """Return the log message and fields identifying the process.
+
+    Resolved once per process and never raises: os.getlogin fails
+    without a controlling terminal, as in containers and daemons.
+    """
+    global _USER_IDENTITY
+
+    if _USER_IDENTITY is None:
+        container = _get_container_id()
+        fields = {
+            "user": _get_user_name(),
+            "pid": os.getpid(),
+            "hostname": platform.node(),
+            "container": container,
+        }
+        message = (
+            f"User: {fields['user']} | pid: {fields['pid']}"
+            f" | host: {fields['hostname']}"
+        )
+        if container is not None:
+            message += f" | container: {container[:12]}"
+        _USER_IDENTITY = (message, fields)
+    return _USER_IDENTITY
+
+
+def _get_user_name() -> str:
+    """Return the login name, trying the terminal, the uid and the env."""
+    try:
+        return os.getlogin()
+    except OSError:
+        pass
+
+    try:
+        import pwd
+
+        return pwd.getpwuid(os.geteuid()).pw_name
+    except (ImportError, KeyError, AttributeError):
+        pass
+
+    for name in ("LOGNAME", "USER", "LNAME", "USERNAME"):
+        user = os.environ.get(name)
+        if user:
+            return user
+    return "unknown"
+
+
+def _get_container_id() -> Optional[str]:
+    """Return the id of the container running the process, if any.
+
+    Only ids in paths made by container runtimes are matched, such as
+    /docker/<id>, cri-containerd-<id>.scope, /kubepods/.../<id> and
+    /var/lib/docker/containers/<id>/, so other 64 hex digit names in
+    cgroups or mounts are not taken for one.
+    """
+    pattern = re.compile(
+        r"(?:docker[/-]|containerd[/:-]|kubepods\S*[/-]|/containers/)"
+        r"([0-9a-f]{64})(?![0-9a-f])"
+    )
+    for path in ("/proc/self/cgroup", "/proc/self/mountinfo"):
+        try:
+            with open(path, "r") as f:
+                content = f.read()
+        except OSError:
+            continue
+        match = pattern.search(content)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _forget_user_identity() -> None:
+    """Resolve the identity again in a forked child, whose pid differs."""
+    global _USER_IDENTITY
+    _USER_IDENTITY = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_user_identity)
+
+
 def get_logger(
     log_file_name: str = LOG_FILE_NAME,
     log_file_path: str = LOG_FILE_PATH,
     console_log_level: str = CONSOLE_LOG_LEVEL,
 ) -> logging.Logger:
-    """Creates a Log File and returns Logger object.
+    """Return the cached Logger object for a log file, creating it once.
+
+    Loggers are kept in a process-wide registry keyed by
+    (log_file_name, log_file_path, console_log_level), so the file and
+    console handlers are built on the first call only.
 
     Parameters
     ----------
@@ -734,28 +2770,1915 @@ def get_logger(
         Logger object.
     """
 
+    key = (log_file_name, log_file_path, console_log_level)
+    logger = _LOGGERS.get(key)
+    if logger is not None:
+        # Recreate the log file if it was removed since the last call
+        for handler in _file_handlers(logger):
+            handler.acquire()
+            try:
+                handler.reopenIfNeeded()
+            finally:
+                handler.release()
+        return logger
+
+    with _LOGGERS_LOCK:
+        # Another thread may have built it while we were waiting
+        logger = _LOGGERS.get(key)
+        if logger is None:
+            logger = _build_logger(
+                log_file_name, log_file_path, console_log_level
+            )
+            _LOGGERS[key] = logger
+    return logger
+
+
+def configure(
+    log_file_name: str = LOG_FILE_NAME,
+    log_file_path: str = LOG_FILE_PATH,
+    backend: str = "sync",
+    queue_size: int = 10000,
+    overflow: str = "block",
+    record_format: str = "text",
+    max_bytes: Optional[int] = None,
+    rotate_every: Optional[float] = None,
+    backup_count: int = 5,
+    compression: Optional[str] = None,
+    flush_size: int = 1 << 16,
+    flush_interval: float = 1.0,
+    fsync: str = "never",
+    ring_size: int = 1 << 24,
+    slot_size: int = 512,
+) -> None:
+    """Choose how records are written to a log file.
+
+    Loggers already in use for this log file, including the ones bound
+    by decorators, are switched to the new backend in place.
+
+    Parameters
+    ----------
+    log_file_name : str, optional
+        Name of the log file, by default LOG_FILE_NAME.
+    log_file_path : str, optional
+        Path of the log file, by default LOG_FILE_PATH.
+    backend : str, optional
+        "sync" writes on the calling thread, "queue" hands records to a
+        background writer thread and "process" sends them to a single
+        writer process shared with the worker processes, forked or
+        spawned, started by this one. "direct" buffers the records of
+        each thread and appends them to the file in large writes, see
+        flush_size. "ring" writes fixed size records into a memory-mapped
+        <log_file_name>.ring file, overwriting the oldest ones, see
+        ring_size, by default "sync".
+    queue_size : int, optional
+        Maximum number of records waiting in the queue, by default 10000.
+    overflow : str, optional
+        Policy when the queue is full: "block", "drop-oldest" or
+        "drop-newest", by default "block".
+    record_format : str, optional
+        "text" writes human readable lines, "json" one JSON object per
+        line and "binary" length-prefixed msgpack frames. Structured
+        records carry the fields logged by the decorators and can be
+        read back with read_records(), by default "text".
+    max_bytes : int, optional
+        Start a new log file once the current one reaches this size,
+        by default None.
+    rotate_every : float, optional
+        Start a new log file every this many seconds, counted from the
+        epoch so that all the processes agree, by default None.
+    backup_count : int, optional
+        Number of rotated log files kept, by default 5.
+    compression : str, optional
+        Compress the rotated log files on a background thread with
+        "gzip" or "zstd". zstd needs Python 3.14 or the zstandard
+        package, gzip is used without them. By default None.
+    flush_size : int, optional
+        Bytes buffered by a thread before the direct backend writes
+        them, by default 65536.
+    flush_interval : float, optional
+        Seconds after which the direct backend writes the buffered
+        records of all the threads, by default 1.0.
+    fsync : str, optional
+        When the direct backend syncs the file to disk: "never", after
+        each write ("batch") or every flush_interval ("interval"), by
+        default "never".
+    ring_size : int, optional
+        Size in bytes of the file of the ring backend, by default 16 MiB.
+    slot_size : int, optional
+        Bytes reserved for each record by the ring backend. Longer
+        records keep their function and event but their message is
+        truncated, by default 512.
+
+    Raises
+    ------
+    TypeError
+        Raised if the backend, the overflow policy, the record format,
+        the compression or the fsync policy is not known, or if the
+        direct or ring backend is asked to rotate the log file.
+    ValueError
+        Raised if a slot is smaller than 64 bytes or larger than the
+        ring.
+    """
+
+    if backend not in _BACKENDS:
+        raise TypeError(f"Backend {backend} not known!")
+    if overflow not in _OVERFLOWS:
+        raise TypeError(f"Overflow policy {overflow} not known!")
+    if record_format not in _FORMATS:
+        raise TypeError(f"Record format {record_format} not known!")
+    if compression is not None and compression not in _COMPRESSIONS:
+        raise TypeError(f"Compression {compression} not known!")
+    if fsync not in _FSYNCS:
+        raise TypeError(f"Fsync policy {fsync} not known!")
+
+    rotation = None
+    if max_bytes is not None or rotate_every is not None:
+        rotation = _Rotation(
+            max_bytes, rotate_every, backup_count, compression
+        )
+    if rotation is not None and backend in ("direct", "ring"):
+        raise TypeError(f"Backend {backend} does not rotate log files!")
+    if slot_size < 64:
+        raise ValueError(f"Ring slot size {slot_size} smaller than 64!")
+    if slot_size > ring_size - _RING_HEADER:
+        raise ValueError(f"Ring size {ring_size} smaller than a slot!")
+
+    with _LOGGERS_LOCK:
+        _CONFIGS[(log_file_name, log_file_path)] = {
+            "backend": backend,
+            "queue_size": queue_size,
+            "overflow": overflow,
+            "record_format": record_format,
+            "rotation": rotation,
+            "flush_size": flush_size,
+            "flush_interval": flush_interval,
+            "fsync": fsync,
+            "ring_size": ring_size,
+            "slot_size": slot_size,
+        }
+
+        for (name, path, console_level), logger in _LOGGERS.items():
+            if (name, path) != (log_file_name, log_file_path):
+                continue
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+                handler.close()
+            _add_handlers(logger, name, path, console_level)
+
+
+def read_records(
+    log_file_name: str = LOG_FILE_NAME,
+    log_file_path: str = LOG_FILE_PATH,
+    record_format: str = "json",
+):
+    """Iterate over the structured records of a log file.
+
+    Parameters
+    ----------
+    log_file_name : str, optional
+        Name of the log file, by default LOG_FILE_NAME.
+    log_file_path : str, optional
+        Path of the log file, by default LOG_FILE_PATH.
+    record_format : str, optional
+        Format the file was written with, "json", "binary" or "ring"
+        for the ring backend, by default "json". The records of a ring
+        are read from <log_file_name>.ring and the rings of its forked
+        children, oldest first.
+
+    Yields
+    ------
+    dict
+        One record: time, level, message, and for records logged by a
+        decorator the function, the event and its fields.
+
+    Raises
+    ------
+    TypeError
+        Raised if the record format is not a structured one.
+    """
+
+    if record_format == "ring":
+        yield from _read_rings(_get_ring_path(log_file_name, log_file_path))
+        return
+    if record_format not in _FORMATS[1:]:
+        raise TypeError(f"Record format {record_format} not known!")
+
+    log_path = _get_log_path(log_file_name, log_file_path)
+    if record_format == "json":
+        with open(log_path, "r") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+
+    with open(log_path, "rb") as f:
+        data = f.read()
+    offset = 0
+    # A frame cut short by a crash is ignored
+    while offset + 4 <= len(data):
+        (size,) = struct.unpack_from(">I", data, offset)
+        offset += 4
+        if offset + size > len(data):
+            break
+        record, _ = _unpack(data, offset)
+        offset += size
+        yield record
+
+
+def dropped_records(
+    log_file_name: str = LOG_FILE_NAME,
+    log_file_path: str = LOG_FILE_PATH,
+) -> int:
+    """Count the records dropped by the queue backend of a log file.
+
+    Parameters
+    ----------
+    log_file_name : str, optional
+        Name of the log file, by default LOG_FILE_NAME.
+    log_file_path : str, optional
+        Path of the log file, by default LOG_FILE_PATH.
+
+    Returns
+    -------
+    int
+        Records dropped since the queue was created.
+    """
+    dropped = 0
+    for (name, path, _), logger in list(_LOGGERS.items()):
+        if (name, path) != (log_file_name, log_file_path):
+            continue
+        for handler in logger.handlers:
+            if isinstance(handler, _QueueHandler):
+                dropped += handler.dropped
+    return dropped
+
+
+def disable() -> None:
+    """Turn all the decorators into plain calls to the wrapped function.
+
+    Same as setting the PYDECLOG_DISABLE environment variable before
+    importing pyDecLog.
+    """
+    global _DISABLED
+    _DISABLED = True
+
+
+def enable() -> None:
+    """Turn the decorators back on after a call to disable()."""
+    global _DISABLED
+    _DISABLED = False
+
+
+def close_all() -> None:
+    """Flush and close the handlers of every cached logger.
+
+    The registry is emptied, so the next call to get_logger builds
+    fresh handlers and releases the open files.
+    """
+    with _LOGGERS_LOCK:
+        loggers = list(_LOGGERS.values())
+        _LOGGERS.clear()
+
+    # Handlers stay attached: loggers already bound by a decorator reopen
+    # their file lazily on the next record
+    for logger in loggers:
+        for handler in logger.handlers:
+            handler.close()
+    for file_handler in list(_FILE_HANDLERS):
+        file_handler.close()
+
+
+def reset() -> None:
+    """Restore pyDecLog to its import-time state.
+
+    Close all the cached loggers and drop any other state kept between
+    calls.
+    """
+    close_all()
+    _CONFIGS.clear()
+    _TIMING_STATS.clear()
+    _stop_tracemalloc()
+    _stop_machine_monitors()
+    _stop_aggregator()
+    _stop_compressor()
+
+
+def _at_exit() -> None:
+    """Log pending timing summaries, then flush queued records."""
+    _flush_timing_stats()
+    close_all()
+    _stop_aggregator()
+    _stop_compressor()
+
+
+atexit.register(_at_exit)
+
+
+class _FileHandler(logging.handlers.WatchedFileHandler):
+    """File handler reopening the log file if it is moved or deleted.
+
+    Because loggers are cached, the file may disappear while the handler
+    is still alive (log rotation tools, tests cleaning up). The parent
+    folder is recreated as well before reopening. The file is checked at
+    most every reopen_interval seconds, after a failed write and when
+    get_logger returns the cached logger.
+    """
+
+    # Seconds between two checks of the file while logging
+    reopen_interval = 1.0
+
+    # When the current file must be rotated by time
+    _rotate_at = math.inf
+
+    # When the file must be checked again, 0 for the next record
+    _check_at = 0.0
+
+    def __init__(
+        self, filename: str, mode: str, rotation: Optional["_Rotation"] = None
+    ) -> None:
+        # Set first, the file is opened by the base class
+        self.rotation = rotation
+        super().__init__(filename, mode)
+        _FILE_HANDLERS.add(self)
+
+    def _open(self):
+        folder = os.path.dirname(self.baseFilename)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder, exist_ok=True)
+        stream = self._open_file()
+        if self.rotation is not None and self.rotation.rotate_every:
+            every = self.rotation.rotate_every
+            now = time.time()
+            start = now - now % every
+            stat = os.fstat(stream.fileno())
+            # A file left by an earlier period is rotated straight away
+            if stat.st_size and stat.st_mtime < start:
+                self._rotate_at = 0.0
+            else:
+                self._rotate_at = start + every
+        return stream
+
+    def _open_file(self):
+        return super()._open()
+
+    def encode(self, record) -> str:
+        """Return the text written to the file for a record."""
+        return self.format(record) + self.terminator
+
+    def emit(self, record) -> None:
+        try:
+            self._prepare().write(self.encode(record))
+            self.flush()
+        except Exception:
+            self._check_at = 0.0
+            self.handleError(record)
+
+    def emit_batch(self, records) -> None:
+        """Write several records and flush the file once."""
+        self.acquire()
+        try:
+            stream = self._prepare()
+            for record in records:
+                try:
+                    stream.write(self.encode(record))
+                except Exception:
+                    self._check_at = 0.0
+                    self.handleError(record)
+            self.flush()
+        finally:
+            self.release()
+
+    def reopenIfNeeded(self) -> None:
+        self._check_at = timer() + self.reopen_interval
+        super().reopenIfNeeded()
+
+    def _prepare(self) -> Any:
+        """Return the file to write to, opened and rotated if needed."""
+        # os.stat on every record is too slow, the check is throttled
+        if timer() >= self._check_at:
+            self.reopenIfNeeded()
+        stream = self.stream
+        if stream is None:
+            stream = self.stream = self._open()
+            self._statstream()
+        rotation = self.rotation
+        if rotation is None:
+            return stream
+        if time.time() >= self._rotate_at or (
+            rotation.max_bytes is not None
+            and stream.tell() >= rotation.max_bytes
+        ):
+            stream = self._rotate(stream, rotation)
+        return stream
+
+    def _rotate(self, stream: Any, rotation: "_Rotation") -> Any:
+        """Move the current file aside and start a new one.
+
+        Processes sharing the file take a lock next to it, and only
+        the first one moves it: the others find a new file in its place
+        and simply reopen it.
+        """
+        with _file_lock(self.baseFilename + ".lock"):
+            try:
+                stat = os.stat(self.baseFilename)
+            except FileNotFoundError:
+                stat = None
+            current = os.fstat(stream.fileno())
+            segment = None
+            if stat is not None and os.path.samestat(stat, current):
+                now = time.time()
+                segment = "%s.%s-%06d" % (
+                    self.baseFilename,
+                    time.strftime("%Y%m%d-%H%M%S", time.localtime(now)),
+                    int(now % 1 * 1e6),
+                )
+                os.rename(self.baseFilename, segment)
+            stream.close()
+            stream = self.stream = self._open()
+            self._statstream()
+        if segment is not None:
+            if rotation.compression is None:
+                _prune_segments(self.baseFilename, rotation.backup_count)
+            else:
+                _get_compressor().submit(segment, self.baseFilename, rotation)
+        return stream
+
+
+class _DirectFileHandler(logging.Handler):
+    """Append records to a log file in large batches.
+
+    Each thread encodes its records into its own buffer, without taking
+    the handler lock, and writes the buffer with a single os.write once
+    it holds flush_size bytes. The descriptor is opened with O_APPEND,
+    so batches from several threads or processes never interleave. A
+    daemon thread writes the buffers of all the threads every
+    flush_interval seconds.
+
+    Unlike _FileHandler, the file is not reopened if it is moved: call
+    close_all() after an external log rotation.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the log file.
+    record_format : str
+        Format of the records, see configure().
+    flush_size : int
+        Bytes buffered by a thread before they are written.
+    flush_interval : float
+        Seconds between two writes of all the buffers.
+    fsync : str
+        When the file is synced to disk, see configure().
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        record_format: str,
+        flush_size: int,
+        flush_interval: float,
+        fsync: str,
+    ) -> None:
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.record_format = record_format
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._fd: Optional[int] = None
+        self._start()
+        _DIRECT_HANDLERS.add(self)
+
+    def _start(self) -> None:
+        """Reset the state which is not shared with a forked child."""
+        self._local = threading.local()
+        self._buffers: List[_ThreadBuffer] = []
+        self._buffers_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def encode(self, record) -> bytes:
+        """Return the bytes written to the file for a record."""
+        if self.record_format == "binary":
+            payload = _pack(_record_fields(record))
+            return struct.pack(">I", len(payload)) + payload
+        return (self.format(record) + "\n").encode("utf-8")
+
+    def handle(self, record) -> bool:
+        # Buffers are per thread, so the handler lock is not needed
+        if not self.filter(record):
+            return False
+        self.emit(record)
+        return True
+
+    def emit(self, record) -> None:
+        try:
+            data = self.encode(record)
+            buffer = getattr(self._local, "buffer", None)
+            if buffer is None or self._flusher is None:
+                buffer = self._register()
+            with buffer.lock:
+                buffer.chunks.append(data)
+                buffer.size += len(data)
+                if buffer.size >= self.flush_size:
+                    self._write(buffer)
+        except Exception:
+            self.handleError(record)
+
+    def _register(self) -> "_ThreadBuffer":
+        """Return the buffer of the thread, starting the flusher."""
+        buffer = getattr(self._local, "buffer", None)
+        with self._buffers_lock:
+            if buffer is None:
+                buffer = _ThreadBuffer()
+                self._local.buffer = buffer
+                self._buffers.append(buffer)
+            if self._flusher is None:
+                self._stopped = threading.Event()
+                self._flusher = threading.Thread(
+                    target=self._run_flusher,
+                    name="pyDecLog-flusher",
+                    daemon=True,
+                )
+                self._flusher.start()
+        return buffer
+
+    def _run_flusher(self) -> None:
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+    def _write(self, buffer: "_ThreadBuffer") -> None:
+        """Write a buffer to the file, called with its lock held."""
+        if not buffer.chunks:
+            return
+        data = memoryview(b"".join(buffer.chunks))
+        buffer.chunks.clear()
+        buffer.size = 0
+
+        fd = self._fd
+        if fd is None:
+            fd = self._open()
+        while data:
+            data = data[os.write(fd, data) :]
+        if self.fsync == "batch":
+            os.fsync(fd)
+
+    def _open(self) -> int:
+        with self._buffers_lock:
+            if self._fd is None:
+                folder = os.path.dirname(self.baseFilename)
+                if folder and not os.path.exists(folder):
+                    os.makedirs(folder, exist_ok=True)
+                flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+                self._fd = os.open(
+                    self.baseFilename,
+                    flags | getattr(os, "O_BINARY", 0),
+                    0o644,
+                )
+            return self._fd
+
+    def flush(self) -> None:
+        """Write the buffers of all the threads."""
+        with self._buffers_lock:
+            buffers = list(self._buffers)
+        for buffer in buffers:
+            with buffer.lock:
+                self._write(buffer)
+
+        # Forget the threads which have finished
+        with self._buffers_lock:
+            self._buffers = [
+                b for b in self._buffers if b.thread.is_alive() or b.chunks
+            ]
+        if self.fsync == "interval" and self._fd is not None:
+            os.fsync(self._fd)
+
+    def close(self) -> None:
+        with self._buffers_lock:
+            flusher = self._flusher
+            self._flusher = None
+        if flusher is not None:
+            self._stopped.set()
+            if flusher is not threading.current_thread():
+                flusher.join()
+        self.flush()
+        with self._buffers_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+        super().close()
+
+
+def _forget_direct_buffers() -> None:
+    """Drop the buffers of the parent in a forked child.
+
+    They are written by the parent, and the flusher thread and the locks
+    held by other threads of the parent do not survive the fork.
+    """
+    for handler in list(_DIRECT_HANDLERS):
+        handler._start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_direct_buffers)
+
+
+class _ThreadBuffer:
+    """Records encoded by one thread and not written yet."""
+
+    def __init__(self) -> None:
+        self.thread = threading.current_thread()
+        self.lock = threading.Lock()
+        self.chunks: List[bytes] = []
+        self.size = 0
+
+
+class _Ring:
+    """Mapping of a ring file and the sequence number of its last slot.
+
+    Shared by the handlers writing to the file, so that loggers bound by
+    decorators before close_all() and the ones built after it take
+    slots in turn instead of overwriting each other. The descriptor
+    holds an exclusive lock on the file, so another process never maps
+    it at the same time, see _map_ring. The mapping is closed once the
+    last handler releases it.
+    """
+
+    def __init__(
+        self, path: str, fd: int, ring: Any, slot_size: int, slot_count: int
+    ) -> None:
+        self.path = path
+        self.fd = fd
+        self.stat = os.fstat(fd)
+        self.map = ring
+        self.slot_size = slot_size
+        self.slot_count = slot_count
+        # Carry on after the newest record of a previous run
+        self.seq = max((seq for seq, _ in _ring_slots(ring)), default=0)
+        self.lock = threading.Lock()
+        self.users = 0
+        # Set once the file is removed or replaced, see _RingHandler._open
+        self.stale = False
+
+    def replaced(self) -> bool:
+        """Return whether the path no longer leads to the mapped file."""
+        try:
+            return not os.path.samestat(os.stat(self.path), self.stat)
+        except OSError:
+            return True
+
+    def release(self) -> None:
+        """Forget a handler, closing the mapping after the last one."""
+        with _RINGS_LOCK:
+            self.users -= 1
+            if self.users:
+                return
+            for key, ring in list(_RINGS.items()):
+                if ring is self:
+                    del _RINGS[key]
+        self.map.flush()
+        self.map.close()
+        # Releases the lock on the file
+        os.close(self.fd)
+
+
+class _RingHandler(logging.Handler):
+    """Write records into a memory-mapped ring of fixed size slots.
+
+    A record is copied into the next slot of the mapping, overwriting
+    the oldest record once the ring is full: no system call is made
+    per record. Its sequence number is written last, so a slot cut
+    short by a crash is skipped by the reader. The pages belong to the
+    page cache and survive the crash of the process.
+
+    The handlers of a ring file share its mapping, see _Ring, and the
+    first one to open it sets its layout. A process finding it mapped
+    by another one, such as a forked child or another worker, writes to
+    its own <log_file_name>.<pid>.ring file.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the ring file.
+    ring_size : int
+        Size of the ring file in bytes.
+    slot_size : int
+        Bytes reserved for each record.
+    """
+
+    def __init__(self, filename: str, ring_size: int, slot_size: int):
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.slot_size = slot_size
+        self.slot_count = (ring_size - _RING_HEADER) // slot_size
+        self._ring: Optional[_Ring] = None
+        self._encoder = json.JSONEncoder(
+            default=_json_default, separators=(",", ":")
+        )
+        _RING_HANDLERS.add(self)
+
+    def encode(self, record) -> Tuple[bytes, int, bool]:
+        """Return the payload of a record, cut to fit in a slot.
+
+        The payload is the message, followed by the fields logged by a
+        decorator as JSON. Return it with the length of the message and
+        whether the record was truncated.
+        """
+        message = record.getMessage().encode("utf-8")
+        fields = getattr(record, "pydeclog", None)
+        data = self._encoder.encode(fields).encode("utf-8") if fields else b""
+        capacity = self.slot_size - _RING_SLOT.size
+        if len(message) + len(data) <= capacity:
+            return message + data, len(message), False
+
+        # Keep what identifies the record, then as much message as fits
+        if fields:
+            fields = {
+                key: fields[key]
+                for key in ("function", "event")
+                if key in fields
+            }
+            data = self._encoder.encode(fields).encode("utf-8")
+            if len(data) > capacity:
+                data = b""
+        message = message[: capacity - len(data)]
+        message = message.decode("utf-8", "ignore").encode("utf-8")
+        return message + data, len(message), True
+
+    def emit(self, record) -> None:
+        try:
+            ring = self._ring
+            if ring is None or ring.stale:
+                ring = self._open()
+            payload, size, truncated = self.encode(record)
+            with ring.lock:
+                ring.seq += 1
+                seq = ring.seq
+                offset = (
+                    _RING_HEADER
+                    + ((seq - 1) % ring.slot_count) * ring.slot_size
+                )
+                mapping = ring.map
+                mapping[offset : offset + 8] = bytes(8)
+                start = offset + _RING_SLOT.size
+                mapping[start : start + len(payload)] = payload
+                _RING_SLOT.pack_into(
+                    mapping,
+                    offset,
+                    seq,
+                    len(payload),
+                    size,
+                    record.created,
+                    record.levelno,
+                    truncated,
+                )
+        except Exception:
+            self.handleError(record)
+
+    def _open(self) -> _Ring:
+        previous = self._ring
+        path = self.baseFilename
+        with _RINGS_LOCK:
+            ring = _RINGS.get(path)
+            if ring is not None and ring.replaced():
+                # Handlers still holding it move to the new file
+                ring.stale = True
+                del _RINGS[path]
+                ring = None
+            if ring is None:
+                ring = _map_ring(path, self.slot_size, self.slot_count)
+            if ring is None:
+                # Mapped by another process, such as the parent of a
+                # forked child or another worker
+                own = f"{path[: -len('.ring')]}.{os.getpid()}.ring"
+                ring = _map_ring(own, self.slot_size, self.slot_count)
+            if ring is None:
+                raise OSError(f"Ring file {path} is locked!")
+            _RINGS[path] = ring
+            ring.users += 1
+        # Records are cut to the slots of the ring already open
+        self.slot_size = ring.slot_size
+        self.slot_count = ring.slot_count
+        self._ring = ring
+        if previous is not None:
+            previous.release()
+        return ring
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            ring = self._ring
+            self._ring = None
+        finally:
+            self.release()
+        if ring is not None:
+            ring.release()
+        super().close()
+
+
+def _map_ring(path: str, slot_size: int, slot_count: int) -> Optional[_Ring]:
+    """Lock and map a ring file, creating it if its layout differs.
+
+    Return None if another process holds the lock: resizing the file
+    under its mapping would crash it with SIGBUS, and the two would
+    overwrite each other's slots.
+    """
+    import mmap
+
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder, exist_ok=True)
+    size = _RING_HEADER + slot_count * slot_size
+    header = struct.pack("<8sII", _RING_MAGIC, slot_size, slot_count)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if not _try_lock(fd):
+            os.close(fd)
+            return None
+        os.lseek(fd, 0, os.SEEK_SET)
+        if os.fstat(fd).st_size != size or os.read(fd, len(header)) != header:
+            # New ring, or one with another layout
+            os.ftruncate(fd, 0)
+            os.ftruncate(fd, size)
+            if hasattr(os, "posix_fallocate"):
+                # Fail now rather than on a page fault if the disk is full
+                os.posix_fallocate(fd, 0, size)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, header)
+        return _Ring(path, fd, mmap.mmap(fd, size), slot_size, slot_count)
+    except BaseException:
+        os.close(fd)
+        raise
+
+
+def _try_lock(fd: int) -> bool:
+    """Take an exclusive lock on a file without waiting for it.
+
+    The lock is released when the descriptor is closed. On Windows, a
+    byte far past the end of the file is locked, so the lock does not
+    stop other processes from reading the file.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        # Windows
+        import msvcrt
+
+        os.lseek(fd, 1 << 40, os.SEEK_SET)
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)  # type: ignore[attr-defined]
+        except OSError:
+            return False
+        return True
+
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _forget_rings() -> None:
+    """Never write into the mappings inherited from the parent.
+
+    The copies of the mappings and locked descriptors are closed in the
+    child, the parent keeps the lock, and the handlers of the child open
+    their own ring files on their next record.
+    """
+    global _RINGS_LOCK
+    rings = set(_RINGS.values())
+    _RINGS.clear()
+    _RINGS_LOCK = threading.Lock()
+    for handler in list(_RING_HANDLERS):
+        if handler._ring is not None:
+            rings.add(handler._ring)
+        handler._ring = None
+    for ring in rings:
+        if ring.users:
+            ring.map.close()
+            os.close(ring.fd)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_rings)
+
+
+def _ring_slots(ring) -> List[Tuple[int, int]]:
+    """Return the sequence number and offset of the valid slots."""
+    magic, slot_size, slot_count = struct.unpack_from("<8sII", ring, 0)
+    if magic != _RING_MAGIC:
+        return []
+    slots = []
+    for index in range(slot_count):
+        offset = _RING_HEADER + index * slot_size
+        seq, length = _RING_SLOT.unpack_from(ring, offset)[:2]
+        # Empty, being written, or not where its sequence number says
+        if seq == 0 or (seq - 1) % slot_count != index:
+            continue
+        if _RING_SLOT.size + length > slot_size:
+            continue
+        slots.append((seq, offset))
+    return slots
+
+
+def _read_ring(path: str) -> List[Dict[str, Any]]:
+    """Decode the records of a ring file, oldest first."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _RING_HEADER:
+        return []
+    records = []
+    for _, offset in sorted(_ring_slots(data)):
+        _, length, size, created, level, truncated = _RING_SLOT.unpack_from(
+            data, offset
+        )
+        start = offset + _RING_SLOT.size
+        try:
+            message = data[start : start + size].decode("utf-8")
+            fields = data[start + size : start + length]
+            fields = json.loads(fields) if fields else {}
+        except ValueError:
+            # Not valid UTF-8 or JSON
+            continue
+        record = {
+            "time": created,
+            "level": logging.getLevelName(level),
+            "message": message,
+            **fields,
+        }
+        if truncated:
+            record["truncated"] = True
+        records.append(record)
+    return records
+
+
+def _read_rings(path: str):
+    """Merge the records of a ring and of its forked children by time."""
+    import heapq
+
+    folder, name = os.path.split(path)
+    root = name[: -len(".ring")]
+    pattern = re.compile(re.escape(root) + r"\.\d+\.ring$")
+    paths = [path] + sorted(
+        os.path.join(folder, entry)
+        for entry in os.listdir(folder or ".")
+        if pattern.match(entry)
+    )
+    rings = [_read_ring(p) for p in paths if os.path.exists(p)]
+    return heapq.merge(*rings, key=lambda record: record.get("time", 0))
+
+
+class _Rotation(NamedTuple):
+    """How a log file is rotated, see configure()."""
+
+    max_bytes: Optional[int]
+    rotate_every: Optional[float]
+    backup_count: int
+    compression: Optional[str]
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Hold an exclusive lock on a file shared by several processes."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            import fcntl
+        except ImportError:
+            # Windows
+            import msvcrt
+
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)  # type: ignore[attr-defined]
+            try:
+                yield
+            finally:
+                msvcrt.locking(  # type: ignore[attr-defined]
+                    fd, msvcrt.LK_UNLCK, 1  # type: ignore[attr-defined]
+                )
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+    finally:
+        # Closing the file releases the flock
+        os.close(fd)
+
+
+def _prune_segments(log_path: str, backup_count: int) -> None:
+    """Delete the oldest rotated files of a log beyond backup_count."""
+    folder, name = os.path.split(log_path)
+    pattern = re.compile(
+        re.escape(name) + r"\.\d{8}-\d{6}-\d{6}(\.gz|\.zst)?$"
+    )
+    segments = sorted(
+        entry for entry in os.listdir(folder or ".") if pattern.match(entry)
+    )
+    for entry in segments[: max(0, len(segments) - backup_count)]:
+        try:
+            os.remove(os.path.join(folder, entry))
+        except FileNotFoundError:
+            # Pruned by another process
+            pass
+
+
+def _zstd_open() -> Optional[Callable]:
+    """Return the open function of a zstd module, None without one."""
+    try:
+        from compression import zstd
+    except ImportError:
+        try:
+            import zstandard as zstd
+        except ImportError:
+            return None
+    return zstd.open
+
+
+class _Compressor(threading.Thread):
+    """Daemon thread compressing rotated log files.
+
+    Compression never runs on the thread writing the records. Each file
+    is compressed into a temporary file first, so a crash never leaves
+    a truncated archive in place of the rotated file.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(name="pyDecLog-compressor", daemon=True)
+        self.queue: "queue.Queue[Optional[Tuple[str, str, _Rotation]]]" = (
+            queue.Queue()
+        )
+
+    def submit(self, segment: str, log_path: str, rotation: _Rotation):
+        self.queue.put((segment, log_path, rotation))
+
+    def run(self) -> None:
+        while True:
+            job = self.queue.get()
+            try:
+                if job is None:
+                    return
+                self._compress(*job)
+            except Exception:
+                # Keep the rotated file uncompressed
+                pass
+            finally:
+                self.queue.task_done()
+
+    def stop(self) -> None:
+        """Compress the files already submitted, then exit."""
+        self.queue.put(None)
+        self.join()
+
+    def _compress(self, segment: str, log_path: str, rotation: _Rotation):
+        opener = _zstd_open() if rotation.compression == "zstd" else None
+        if opener is None:
+            import gzip
+
+            opener, extension = gzip.open, _COMPRESSIONS["gzip"]
+        else:
+            extension = _COMPRESSIONS["zstd"]
+
+        import shutil
+
+        target = segment + extension
+        with open(segment, "rb") as source, opener(target + ".tmp", "wb") as f:
+            shutil.copyfileobj(source, f, 1 << 20)
+        os.replace(target + ".tmp", target)
+        os.remove(segment)
+        _prune_segments(log_path, rotation.backup_count)
+
+
+def _get_compressor() -> _Compressor:
+    """Return the running thread compressing rotated log files."""
+    global _COMPRESSOR
+    with _COMPRESSOR_LOCK:
+        if _COMPRESSOR is None or not _COMPRESSOR.is_alive():
+            _COMPRESSOR = _Compressor()
+            _COMPRESSOR.start()
+        return _COMPRESSOR
+
+
+def _stop_compressor() -> None:
+    """Finish the pending compressions and stop their thread."""
+    global _COMPRESSOR
+    with _COMPRESSOR_LOCK:
+        compressor = _COMPRESSOR
+        _COMPRESSOR = None
+    if compressor is not None and compressor.is_alive():
+        compressor.stop()
+
+
+class _BinaryFileHandler(_FileHandler):
+    """File handler writing records as length-prefixed msgpack frames.
+
+    Each frame is a 4 bytes big-endian length followed by the record
+    encoded with _pack, see read_records().
+    """
+
+    def __init__(
+        self, filename: str, rotation: Optional["_Rotation"] = None
+    ) -> None:
+        super().__init__(filename, "ab", rotation)
+
+    def _open_file(self):
+        return open(self.baseFilename, self.mode)
+
+    def encode(self, record) -> bytes:  # type: ignore[override]
+        # The file is opened in binary mode
+        payload = _pack(_record_fields(record))
+        return struct.pack(">I", len(payload)) + payload
+
+
+class _TextFormatter(logging.Formatter):
+    """Format a record as a text line, calling strftime once a second."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            "%(asctime)s | %(levelname)s %(message)s", "%Y/%m/%d | %H:%M:%S"
+        )
+        self._second: Tuple[int, str] = (-1, "")
+
+    def formatTime(self, record, datefmt=None) -> str:
+        second = int(record.created)
+        cached = self._second
+        if cached[0] != second:
+            cached = (second, super().formatTime(record, datefmt))
+            self._second = cached
+        return cached[1]
+
+
+class _JsonFormatter(logging.Formatter):
+    """Format a record as one JSON object, see _record_fields."""
+
+    def format(self, record) -> str:
+        return json.dumps(_record_fields(record), default=_json_default)
+
+
+def _json_default(value: Any) -> Any:
+    """Serialise the values json does not know, with bounded length."""
+    if isinstance(value, _Rendered):
+        return value.plain()
+    return _ARG_REPR.repr(value)
+
+
+def _extra(func: Callable, event: str, **fields) -> Dict[str, Any]:
+    """Build the extra argument of a log call made by a decorator.
+
+    Structured formats serialise these fields, the text format ignores
+    them.
+    """
+    return {
+        "pydeclog": {"function": func.__qualname__, "event": event, **fields}
+    }
+
+
+class _Signature(NamedTuple):
+    """Signature of a function, computed once by _get_signature."""
+
+    text: str
+    parameters: Tuple[str, ...]
+    annotations: Dict[str, Any]
+
+
+def _get_signature(func: Callable) -> _Signature:
+    """Return the signature of a function, cached across decorators.
+
+    inspect.signature is slow, so it is computed when the function is
+    decorated rather than on every call.
+    """
+    try:
+        return _SIGNATURES[func]
+    except (KeyError, TypeError):
+        pass
+
+    try:
+        sig = inspect.signature(func)
+    except (TypeError, ValueError):
+        # Some builtins do not expose their signature
+        signature = _Signature("(...)", (), {})
+    else:
+        annotations = {
+            name: parameter.annotation
+            for name, parameter in sig.parameters.items()
+            if parameter.annotation is not parameter.empty
+        }
+        if sig.return_annotation is not sig.empty:
+            annotations["return"] = sig.return_annotation
+        signature = _Signature(str(sig), tuple(sig.parameters), annotations)
+
+    try:
+        _SIGNATURES[func] = signature
+    except TypeError:
+        # Not weak referenceable
+        pass
+    return signature
+
+
+def _record_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    """Return the fields of a structured record."""
+    return {
+        "time": record.created,
+        "level": record.levelname,
+        "message": record.getMessage(),
+        **getattr(record, "pydeclog", {}),
+    }
+
+
+def _pack(value: Any) -> bytes:
+    """Encode a value with the subset of msgpack used by binary records.
+
+    Values which are not None, bool, int, float, str, bytes, a list, a
+    tuple or a dict are stored as their repr.
+    """
+    if value is None:
+        return b"\xc0"
+    if value is True:
+        return b"\xc3"
+    if value is False:
+        return b"\xc2"
+    if isinstance(value, int):
+        if 0 <= value < 128:
+            return struct.pack(">B", value)
+        if -(2**63) <= value < 2**63:
+            return b"\xd3" + struct.pack(">q", value)
+        value = repr(value)
+    if isinstance(value, float):
+        return b"\xcb" + struct.pack(">d", value)
+    if isinstance(value, _Rendered):
+        return _pack(value.plain())
+    if isinstance(value, (list, tuple)):
+        return (
+            b"\xdd"
+            + struct.pack(">I", len(value))
+            + b"".join(_pack(v) for v in value)
+        )
+    if isinstance(value, dict):
+        return (
+            b"\xdf"
+            + struct.pack(">I", len(value))
+            + b"".join(_pack(str(k)) + _pack(v) for k, v in value.items())
+        )
+    if isinstance(value, (bytes, bytearray)):
+        return b"\xc6" + struct.pack(">I", len(value)) + bytes(value)
+    if not isinstance(value, str):
+        value = _ARG_REPR.repr(value)
+    data = value.encode("utf-8", "replace")
+    return b"\xdb" + struct.pack(">I", len(data)) + data
+
+
+def _unpack(data: bytes, offset: int = 0) -> Tuple[Any, int]:
+    """Decode one value written by _pack, return it and the next offset."""
+    tag = data[offset]
+    offset += 1
+    if tag < 0x80:
+        return tag, offset
+    if tag == 0xC0:
+        return None, offset
+    if tag in (0xC2, 0xC3):
+        return tag == 0xC3, offset
+    if tag == 0xD3:
+        return struct.unpack_from(">q", data, offset)[0], offset + 8
+    if tag == 0xCB:
+        return struct.unpack_from(">d", data, offset)[0], offset + 8
+
+    (size,) = struct.unpack_from(">I", data, offset)
+    offset += 4
+    if tag == 0xDB:
+        return data[offset : offset + size].decode("utf-8"), offset + size
+    if tag == 0xC6:
+        return bytes(data[offset : offset + size]), offset + size
+    if tag == 0xDD:
+        items = []
+        for _ in range(size):
+            item, offset = _unpack(data, offset)
+            items.append(item)
+        return items, offset
+    if tag == 0xDF:
+        mapping = {}
+        for _ in range(size):
+            key, offset = _unpack(data, offset)
+            mapping[key], offset = _unpack(data, offset)
+        return mapping, offset
+    raise ValueError(f"Unknown msgpack tag {tag:#x}!")
+
+
+class _Logger(logging.Logger):
+    """Logger whose level can be changed after being cached.
+
+    Loggers in the registry are not known to the logging manager, which
+    therefore never clears their isEnabledFor cache: logging.disable()
+    is checked before the cache.
+    """
+
+    def setLevel(self, level) -> None:
+        super().setLevel(level)
+        self._cache.clear()  # type: ignore[attr-defined]
+
+    def isEnabledFor(self, level) -> bool:
+        if self.manager.disable >= level:
+            return False
+        return super().isEnabledFor(level)
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """Stream handler always writing to the current sys.stderr.
+
+    A cached handler must not hold on to the stream found at creation
+    time, since notebooks and test runners swap sys.stderr.
+    """
+
+    def __init__(self) -> None:
+        logging.Handler.__init__(self)
+
+    @property
+    def stream(self):
+        # Records must not be captured back by @message(stderr=True)
+        stream = sys.stderr
+        if isinstance(stream, _StreamProxy):
+            return stream._stream
+        return stream
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """Queue listener whose stop sentinel waits for room in the queue."""
+
+    queue: "queue.Queue[Any]"
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)  # type: ignore[attr-defined]
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Push records onto a bounded queue drained by a writer thread.
+
+    Parameters
+    ----------
+    handlers : list
+        Handlers run by the background writer thread.
+    queue_size : int
+        Maximum number of records waiting to be written.
+    overflow : str
+        What to do when the queue is full: "block", "drop-oldest" or
+        "drop-newest".
+    """
+
+    queue: "queue.Queue[Any]"
+
+    def __init__(self, handlers, queue_size: int, overflow: str) -> None:
+        super().__init__(queue.Queue(queue_size))
+        self.overflow = overflow
+        self.dropped = 0
+        self.listener = _QueueListener(
+            self.queue, *handlers, respect_handler_level=True
+        )
+        self.listener.start()
+        _QUEUE_HANDLERS.add(self)
+
+    def enqueue(self, record) -> None:
+        # Called with the handler lock held, so counting is thread-safe
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            if self.overflow == "drop-oldest":
+                try:
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+                except queue.Empty:
+                    pass
+                self.queue.put_nowait(record)
+
+    def prepare(self, record) -> logging.LogRecord:
+        record = super().prepare(record)
+        # Render the logged values on the calling thread, the caller may
+        # change them before the writer thread formats the record
+        fields = getattr(record, "pydeclog", None)
+        if fields:
+            record.pydeclog = {
+                key: value.plain() if isinstance(value, _Rendered) else value
+                for key, value in fields.items()
+            }
+        return record
+
+    def emit(self, record) -> None:
+        # Restart the writer thread if the handler was closed, or in a
+        # forked child, see _forget_queues
+        if self.listener._thread is None:
+            self.listener.start()
+        super().emit(record)
+
+    def flush(self) -> None:
+        """Wait for the writer thread to drain the queue."""
+        if self.listener._thread is not None:
+            self.queue.join()
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            if self.listener._thread is not None:
+                self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+        finally:
+            self.release()
+        super().close()
+
+
+def _forget_queues() -> None:
+    """Give the queue handlers of a forked child new, empty queues.
+
+    The child inherits the queues but not the writer threads, and the
+    records already queued are written by the parent.
+    """
+    for handler in list(_QUEUE_HANDLERS):
+        handler.queue = queue.Queue(handler.queue.maxsize)
+        handler.listener.queue = handler.queue
+        handler.listener._thread = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_queues)
+
+
+class _AggregatorHandler(logging.Handler):
+    """Send records to the process writing the log files.
+
+    Each connection starts with the token of the writer process, then
+    each record is sent as a 4 bytes big-endian length followed by its
+    attributes encoded as JSON, see _serve_aggregator. The connection
+    is opened lazily and dropped in a forked child, see
+    _forget_aggregator, so worker processes never share a socket with
+    their parent.
+
+    Parameters
+    ----------
+    address : str
+        Token and address of the writer process, see _get_aggregator.
+    log_path : str
+        Absolute path of the log file.
+    record_format : str, optional
+        Format of the log file, by default "text".
+    rotation : _Rotation, optional
+        How the writer process rotates the log file, by default None.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        log_path: str,
+        record_format: str = "text",
+        rotation: Optional[_Rotation] = None,
+    ) -> None:
+        super().__init__()
+        token, _, self.address = address.partition("@")
+        self.token = token.encode("ascii")
+        self.log_path = log_path
+        self.record_format = record_format
+        self.rotation = rotation
+        self._socket: Optional[Any] = None
+        _AGGREGATOR_HANDLERS.add(self)
+
+    def encode(self, record) -> bytes:
+        """Return the frame sent for a record."""
+        fields = dict(record.__dict__)
+        # Like QueueHandler, send the merged message rather than the args
+        fields["msg"] = record.getMessage()
+        fields["args"] = None
+        if record.exc_info:
+            fields["exc_text"] = logging.Formatter().formatException(
+                record.exc_info
+            )
+        fields["exc_info"] = None
+        fields["pydeclog_file"] = [
+            self.log_path,
+            self.record_format,
+            self.rotation,
+        ]
+        payload = json.dumps(fields, default=_json_default).encode("utf-8")
+        return struct.pack(">I", len(payload)) + payload
+
+    def emit(self, record) -> None:
+        try:
+            frame = self.encode(record)
+            sock = self._socket
+            if sock is None:
+                sock = self._connect()
+            sock.sendall(frame)
+        except Exception:
+            self._disconnect()
+            self.handleError(record)
+
+    def _connect(self) -> Any:
+        import socket
+
+        self._disconnect()
+        family, _, location = self.address.partition(":")
+        if family == "unix":
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(location)
+        else:
+            host, _, port = location.rpartition(":")
+            sock = socket.create_connection((host, int(port)))
+        self._socket = sock
+        sock.sendall(self.token)
+        return sock
+
+    def _disconnect(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            self._disconnect()
+        finally:
+            self.release()
+        super().close()
+
+
+def _get_aggregator() -> str:
+    """Return the address of the process writing the log files.
+
+    The process is started once, and its address exported in the
+    PYDECLOG_AGGREGATOR environment variable so that forked and spawned
+    workers send their records to it as well. The address is prefixed
+    with a random token: the writer process drops connections which do
+    not start with it, so other local users cannot make it write files.
+    """
+    global _AGGREGATOR
+
+    address = os.environ.get(_AGGREGATOR_ENV)
+    if address:
+        return address
+
+    with _AGGREGATOR_LOCK:
+        address = os.environ.get(_AGGREGATOR_ENV)
+        if address:
+            return address
+
+        import subprocess
+
+        folder = os.path.dirname(os.path.abspath(__file__))
+        code = (
+            f"import sys; sys.path.insert(0, {folder!r}); "
+            f"from {__name__} import _serve_aggregator; _serve_aggregator()"
+        )
+        process = subprocess.Popen(
+            [sys.executable, "-c", code],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        address = process.stdout.readline().strip() if process.stdout else ""
+        if not address:
+            process.kill()
+            raise RuntimeError("Log writer process failed to start!")
+
+        os.environ[_AGGREGATOR_ENV] = address
+        _AGGREGATOR = process
+    return address
+
+
+def _stop_aggregator() -> None:
+    """Stop the writer process started by this process, if any.
+
+    Closing its stdin tells it to write the records still in flight and
+    exit.
+    """
+    global _AGGREGATOR
+
+    with _AGGREGATOR_LOCK:
+        process = _AGGREGATOR
+        _AGGREGATOR = None
+        if process is None:
+            return
+        os.environ.pop(_AGGREGATOR_ENV, None)
+        os.environ.pop(_AGGREGATOR_FILES_ENV, None)
+
+    process.stdin.close()
+    try:
+        process.wait(timeout=_AGGREGATOR_TIMEOUT)
+    except Exception:
+        process.kill()
+        process.wait()
+
+
+def _get_aggregated_files() -> Dict[str, Any]:
+    """Return the format and rotation of the files of the writer process.
+
+    Keyed by absolute path, they are exported by the processes which
+    configured the files in the PYDECLOG_AGGREGATOR_FILES environment
+    variable, see _export_aggregated_file.
+    """
+    value = os.environ.get(_AGGREGATOR_FILES_ENV)
+    return json.loads(value) if value else {}
+
+
+def _export_aggregated_file(
+    log_path: str, record_format: str, rotation: Optional[_Rotation]
+) -> None:
+    """Let the workers write a configured file through the writer process.
+
+    Workers only send their records to the writer process for the files
+    exported here, and with the same options, so the file is written the
+    same way whichever process connects first.
+    """
+    with _AGGREGATOR_LOCK:
+        files = _get_aggregated_files()
+        files[log_path] = [record_format, rotation]
+        os.environ[_AGGREGATOR_FILES_ENV] = json.dumps(files)
+
+
+def _split_frames(buffer: bytes) -> Tuple[List[bytes], bytes]:
+    """Return the complete length-prefixed frames and the bytes left."""
+    payloads = []
+    offset = 0
+    while offset + 4 <= len(buffer):
+        (size,) = struct.unpack_from(">I", buffer, offset)
+        if offset + 4 + size > len(buffer):
+            break
+        payloads.append(buffer[offset + 4 : offset + 4 + size])
+        offset += 4 + size
+    return payloads, buffer[offset:]
+
+
+def _authenticate(conn: Any, token: bytes) -> Optional[bytes]:
+    """Return the bytes sent after the token, None if it does not match."""
+    import hmac
+
+    buffer = b""
+    while len(buffer) < len(token):
+        data = conn.recv(_AGGREGATOR_READ)
+        if not data:
+            return None
+        buffer += data
+    if not hmac.compare_digest(buffer[: len(token)], token):
+        return None
+    return buffer[len(token) :]
+
+
+def _forget_aggregator() -> None:
+    """Leave the writer process to the parent in a forked child.
+
+    The child keeps using it through the environment variable, but only
+    the parent stops it. The handlers of the child connect again on
+    their next record.
+    """
+    global _AGGREGATOR
+    process = _AGGREGATOR
+    _AGGREGATOR = None
+    if process is not None:
+        process.stdin.close()
+    # The sockets of the parent are left to the parent
+    for handler in list(_AGGREGATOR_HANDLERS):
+        handler._socket = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_aggregator)
+
+
+def _serve_aggregator() -> None:
+    """Write the records sent by _AggregatorHandler until stdin closes.
+
+    Run in the writer process: print the token and the address to
+    listen on, then serve every connection starting with the token on
+    its own thread. The records of each connection are written in
+    batches, one flush per read from the socket, through the same file
+    handlers as the sync backend.
+    """
+    import secrets
+    import shutil
+    import socket
+
+    token = secrets.token_hex(16).encode("ascii")
+    server, address, folder = _listen_aggregator()
+
+    handlers: Dict[str, _FileHandler] = {}
+    lock = threading.Lock()
+    connections: List[threading.Thread] = []
+
+    def get_handler(log_path: str, record_format: str, rotation):
+        with lock:
+            handler = handlers.get(log_path)
+            if handler is None:
+                handler = _build_file_handler(
+                    log_path,
+                    record_format,
+                    None if rotation is None else _Rotation(*rotation),
+                )
+                handlers[log_path] = handler
+            return handler
+
+    def serve(conn) -> None:
+        with conn:
+            # Starts with the records sent along with the token, if any
+            buffer = _authenticate(conn, token)
+            while buffer is not None:
+                payloads, buffer = _split_frames(buffer)
+                batches: Dict[_FileHandler, List[logging.LogRecord]] = {}
+                for payload in payloads:
+                    fields = json.loads(payload)
+                    file_options = fields.pop("pydeclog_file")
+                    record = logging.makeLogRecord(fields)
+                    handler = get_handler(*file_options)
+                    batches.setdefault(handler, []).append(record)
+                for handler, records in batches.items():
+                    handler.emit_batch(records)
+                data = conn.recv(_AGGREGATOR_READ)
+                if not data:
+                    break
+                buffer += data
+
+    def accept() -> None:
+        # Polled, so the connections still queued when stdin closes are
+        # served before the socket is closed
+        server.settimeout(_AGGREGATOR_POLL)
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                if stopping.is_set():
+                    return
+                continue
+            except OSError:
+                return
+            thread = threading.Thread(target=serve, args=(conn,), daemon=True)
+            thread.start()
+            connections.append(thread)
+
+    stopping = threading.Event()
+    acceptor = threading.Thread(target=accept, daemon=True)
+    acceptor.start()
+    print(f"{token.decode('ascii')}@{address}", flush=True)
+
+    # The process which started us closes stdin when it exits
+    sys.stdin.read()
+
+    stopping.set()
+    acceptor.join()
+    server.close()
+    deadline = time.monotonic() + _AGGREGATOR_TIMEOUT
+    for thread in list(connections):
+        thread.join(max(0.0, deadline - time.monotonic()))
+    with lock:
+        for handler in handlers.values():
+            handler.close()
+    if folder is not None:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def _listen_aggregator() -> Tuple[Any, str, Optional[str]]:
+    """Return the listening socket of the writer process and its address.
+
+    A Unix socket readable by the user only is preferred, in a temporary
+    folder returned as well, else a TCP socket on the loopback interface.
+    """
+    import socket
+    import tempfile
+
+    if hasattr(socket, "AF_UNIX"):
+        folder = tempfile.mkdtemp(prefix="pydeclog-")
+        location = os.path.join(folder, "aggregator.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(location)
+        os.chmod(location, 0o600)
+        server.listen(128)
+        return server, f"unix:{location}", folder
+
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(128)
+    return server, "tcp:127.0.0.1:%d" % server.getsockname()[1], None
+
+
+def _file_handlers(logger: logging.Logger) -> List["_FileHandler"]:
+    """Return the file handlers of a logger, queued or not."""
+    handlers: List[logging.Handler] = []
+    for handler in logger.handlers:
+        if isinstance(handler, _QueueHandler):
+            handlers.extend(handler.listener.handlers)
+        else:
+            handlers.append(handler)
+    return [h for h in handlers if isinstance(h, _FileHandler)]
+
+
+def _build_logger(
+    log_file_name: str, log_file_path: str, console_log_level: str
+) -> logging.Logger:
+    """Create a Log File and return a new Logger object.
+
+    Parameters
+    ----------
+    log_file_name : str
+        Name of the log file.
+    log_file_path : str
+        Path of the log file.
+    console_log_level : str
+        Console log level.
+
+    Returns
+    -------
+    object
+        Logger object.
+    """
+
+    logger = _Logger(log_file_name)
+    _add_handlers(logger, log_file_name, log_file_path, console_log_level)
+    return logger
+
+
+def _get_inherited_options(log_path: str) -> Dict[str, Any]:
+    """Return the options of a log file left unconfigured in a worker.
+
+    Workers of a process using the process backend write the files it
+    configured through the same writer process, the others are written
+    with the sync backend.
+    """
+    inherited = _get_aggregated_files().get(log_path)
+    if inherited is None or not os.environ.get(_AGGREGATOR_ENV):
+        return {}
+    record_format, rotation = inherited
+    return {
+        "backend": "process",
+        "record_format": record_format,
+        "rotation": None if rotation is None else _Rotation(*rotation),
+    }
+
+
+def _add_handlers(
+    logger: logging.Logger,
+    log_file_name: str,
+    log_file_path: str,
+    console_log_level: str,
+) -> None:
+    """Attach the file and console handlers to a logger.
+
+    The backend chosen with configure() for this log file decides
+    whether records are written on the calling thread or queued.
+
+    Parameters
+    ----------
+    logger : object
+        Logger object.
+    log_file_name : str
+        Name of the log file.
+    log_file_path : str
+        Path of the log file.
+    console_log_level : str
+        Console log level.
+    """
+
+    log_path = _get_log_path(log_file_name, log_file_path)
+
+    options = _CONFIGS.get((log_file_name, log_file_path))
+    if options is None:
+        options = _get_inherited_options(os.path.abspath(log_path))
+
     # Create logging folder
     if log_file_path != "./" and not os.path.exists(log_file_path):
         os.makedirs(log_file_path)
 
-    # Build Log File Full Path
-    log_path = (
-        log_file_name
-        if os.path.exists(log_file_name)
-        else os.path.join(log_file_path, (str(log_file_name) + ".log"))
-    )
-
     # Create handler for the log file
-    logger = logging.Logger(log_file_name)
-    handler = logging.FileHandler(log_path, "a+")
-    formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)s %(message)s", "%Y/%m/%d | %H:%M:%S"
-    )
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    backend = options.get("backend", "sync")
+    handler: logging.Handler
+    if backend == "process":
+        handler = _AggregatorHandler(
+            _get_aggregator(),
+            os.path.abspath(log_path),
+            options["record_format"],
+            options.get("rotation"),
+        )
+        _export_aggregated_file(
+            handler.log_path, handler.record_format, handler.rotation
+        )
+    elif backend == "ring":
+        handler = _RingHandler(
+            _get_ring_path(log_file_name, log_file_path),
+            options["ring_size"],
+            options["slot_size"],
+        )
+    elif backend == "direct":
+        handler = _DirectFileHandler(
+            log_path,
+            options["record_format"],
+            options["flush_size"],
+            options["flush_interval"],
+            options["fsync"],
+        )
+        _set_record_formatter(handler, options["record_format"])
+    else:
+        handler = _build_file_handler(
+            log_path,
+            options.get("record_format", "text"),
+            options.get("rotation"),
+        )
 
     # Create handler for the console output
-    console = logging.StreamHandler()
+    console = _ConsoleHandler()
 
     if console_log_level.lower() == "info":
         console.setLevel(logging.INFO)
@@ -770,7 +4693,81 @@ def get_logger(
     formatter = logging.Formatter("%(message)s")
     # Tell the handler to use this format
     console.setFormatter(formatter)
-    # Add the handler to the root logger
-    logger.addHandler(console)
 
-    return logger
+    if backend == "queue":
+        logger.addHandler(
+            _QueueHandler(
+                [handler, console], options["queue_size"], options["overflow"]
+            )
+        )
+    else:
+        logger.addHandler(handler)
+        logger.addHandler(console)
+
+
+def _build_file_handler(
+    log_path: str, record_format: str, rotation: Optional[_Rotation] = None
+) -> _FileHandler:
+    """Create the handler writing records to a log file in a format."""
+    handler: _FileHandler
+    if record_format == "binary":
+        handler = _BinaryFileHandler(log_path, rotation)
+    else:
+        handler = _FileHandler(log_path, "a+", rotation=rotation)
+    _set_record_formatter(handler, record_format)
+    return handler
+
+
+def _set_record_formatter(handler: logging.Handler, record_format: str):
+    """Give a file handler the formatter of a record format."""
+    if record_format == "json":
+        handler.setFormatter(_JsonFormatter())
+    else:
+        handler.setFormatter(_TextFormatter())
+
+
+def _get_log_path(log_file_name: str, log_file_path: str) -> str:
+    """Build the full path of a log file."""
+    return (
+        log_file_name
+        if os.path.exists(log_file_name)
+        else os.path.join(log_file_path, (str(log_file_name) + ".log"))
+    )
+
+
+def _get_ring_path(log_file_name: str, log_file_path: str) -> str:
+    """Build the full path of the file of the ring backend."""
+    return os.path.join(log_file_path, str(log_file_name) + ".ring")
+
+
+def _main(argv: Optional[List[str]] = None) -> None:
+    """Print the records of a ring file in the text or JSON format.
+
+    Usage: python pyDecLog.py LOG.ring [--json]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="pyDecLog", description="Decode the records of a ring file."
+    )
+    parser.add_argument("ring", help="path of the <log_file_name>.ring file")
+    parser.add_argument(
+        "--json", action="store_true", help="print one JSON object per line"
+    )
+    args = parser.parse_args(argv)
+
+    folder, name = os.path.split(args.ring)
+    if name.endswith(".ring"):
+        name = name[: -len(".ring")]
+    for record in read_records(name, folder or ".", "ring"):
+        if args.json:
+            print(json.dumps(record, default=_json_default))
+            continue
+        when = time.strftime(
+            "%Y/%m/%d | %H:%M:%S", time.localtime(record.get("time", 0))
+        )
+        print(f"{when} | {record.get('level')} {record.get('message')}")
+
+
+if __name__ == "__main__":
+    _main()
@@ -1,7 +1,16 @@
 from pyDecLog import arguments as args
+from pyDecLog import get_logger
 import unittest
 import os
 import shutil
+import numpy as np
+
+
+class Unprintable:
+    """Fail as soon as a decorator tries to render it."""
+
+    def __repr__(self):
+        raise AssertionError("Argument should not be rendered!")
 
 
 class TestArguments(unittest.TestCase):
@@ -143,6 +152,59 @@ class TestArguments(unittest.TestCase):
         self.assertTrue(os.path.exists("./test_log_folder/LOG.log"))
         self.addCleanup(shutil.rmtree, "./test_log_folder")
 
+    def test_bounded_list(self):
+        @args
+        def dummy(x):
+            return x
+
+        dummy(list(range(1_000_000)))
+        content = open("./LOG.log", "r").read()
+        self.assertTrue(
+            content.find("Method's args: ([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, ...]")
+            != -1
+        )
+        self.assertTrue(content.find("(len=1000000)") != -1)
+        self.assertLess(len(content), 1000)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_limits(self):
+        @args(max_items=2, max_length=8)
+        def dummy(x, y=None):
+            return x
+
+        dummy([1, 2, 3], y="abcdefghij")
+        content = open("./LOG.log", "r").read()
+        self.assertTrue(content.find("[1, 2, ...] (len=3)") != -1)
+        self.assertTrue(content.find("{'y': 'a...ij'}") != -1)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_summaries(self):
+        @args
+        def dummy(x, y):
+            return x
+
+        dummy(np.zeros((1000, 3)), b"x" * 1000)
+        content = open("./LOG.log", "r").read()
+        self.assertTrue(
+            content.find("ndarray(shape=(1000, 3), dtype=float64)") != -1
+        )
+        self.assertTrue(content.find("bytes(len=1000)") != -1)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_not_rendered_when_filtered(self):
+        logger = get_logger()
+        reject = lambda record: False  # noqa: E731
+        logger.addFilter(reject)
+        self.addCleanup(logger.removeFilter, reject)
+
+        @args
+        def dummy(x):
+            return 1
+
+        self.assertEqual(dummy(Unprintable()), 1)
+        self.assertTrue(os.stat("./LOG.log").st_size == 0)
+        self.addCleanup(os.remove, "./LOG.log")
+
     def test_raise_run_time_warning(self):
 
         with self.assertRaises(RuntimeWarning):
@@ -0,0 +1,177 @@
+from pyDecLog import timing as tim
+from pyDecLog import message as mes
+from pyDecLog import arguments as args
+from pyDecLog import typing as typ
+from contextlib import asynccontextmanager
+from contextlib import redirect_stdout
+from io import StringIO
+import asyncio
+import inspect
+import unittest
+import os
+
+
+class TestAsync(unittest.TestCase):
+    def test_same_function_return(self):
+        @tim
+        async def dummy(x):
+            return x
+
+        self.assertTrue(inspect.iscoroutinefunction(dummy))
+        self.assertEqual(asyncio.run(dummy(1)), 1)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_timing_awaited_duration(self):
+        @tim(log_file_name="test")
+        async def dummy(x):
+            await asyncio.sleep(0.1)
+            return x
+
+        asyncio.run(dummy(1))
+        content = open("./test.log", "r").read()
+        elapsed = float(content.split("executed in: ")[1].split()[0])
+
+        self.assertGreaterEqual(elapsed, 0.1)
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_typing_output(self):
+        @typ(log_file_name="test")
+        async def dummy(x):
+            return x
+
+        asyncio.run(dummy(1))
+        self.assertTrue(
+            open("./test.log", "r").read().find("<class 'int'>") != -1
+        )
+        self.assertTrue(open("./test.log", "r").read().find("coroutine") == -1)
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_message_per_task(self):
+        @mes(log_file_name="test_a")
+        async def first():
+            for i in range(3):
+                print(f"first {i}")
+                await asyncio.sleep(0)
+
+        @mes(log_file_name="test_b")
+        async def second():
+            for i in range(3):
+                print(f"second {i}")
+                await asyncio.sleep(0)
+
+        async def main():
+            await asyncio.gather(first(), second())
+
+        s = StringIO()
+        with redirect_stdout(s):
+            asyncio.run(main())
+        content_a = open("./test_a.log", "r").read()
+        content_b = open("./test_b.log", "r").read()
+
+        self.assertEqual(s.getvalue(), "")
+        self.assertEqual(content_a.count("INFO first"), 3)
+        self.assertEqual(content_b.count("INFO second"), 3)
+        self.assertTrue(content_a.find("second") == -1)
+        self.assertTrue(content_b.find("first") == -1)
+        self.addCleanup(os.remove, "./test_a.log")
+        self.addCleanup(os.remove, "./test_b.log")
+
+    def test_async_generator(self):
+        @args(log_file_name="test")
+        @tim(log_file_name="test")
+        async def dummy(x):
+            for i in range(x):
+                await asyncio.sleep(0)
+                yield i
+
+        async def main():
+            return [i async for i in dummy(3)]
+
+        self.assertTrue(inspect.isasyncgenfunction(dummy))
+        self.assertEqual(asyncio.run(main()), [0, 1, 2])
+        content = open("./test.log", "r").read()
+
+        self.assertTrue(content.find("Method's args: (3,)") != -1)
+        self.assertTrue(content.find("dummy was executed in") != -1)
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_async_generator_athrow(self):
+        caught = []
+
+        @asynccontextmanager
+        @tim(log_file_name="test")
+        async def resource():
+            try:
+                yield "resource"
+            except ValueError as error:
+                caught.append(error)
+
+        async def main():
+            async with resource() as value:
+                raise ValueError(value)
+
+        asyncio.run(main())
+
+        self.assertEqual([str(error) for error in caught], ["resource"])
+        self.assertTrue(
+            open("./test.log", "r").read().find("was executed in") != -1
+        )
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_async_generator_asend(self):
+        @tim(log_file_name="test")
+        async def echo():
+            received = None
+            while True:
+                received = yield received
+
+        async def main():
+            generator = echo()
+            await generator.asend(None)
+            first = await generator.asend(1)
+            second = await generator.asend(2)
+            await generator.aclose()
+            return first, second
+
+        self.assertEqual(asyncio.run(main()), (1, 2))
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_async_generator_message(self):
+        @mes(log_file_name="test")
+        async def dummy():
+            for i in range(3):
+                print(f"inside {i}")
+                yield i
+
+        async def main():
+            async for i in dummy():
+                print(f"consumer {i}")
+                if i == 1:
+                    break
+
+        s = StringIO()
+        with redirect_stdout(s):
+            asyncio.run(main())
+            print("after")
+        content = open("./test.log", "r").read()
+
+        self.assertEqual(s.getvalue(), "consumer 0\nconsumer 1\nafter\n")
+        self.assertEqual(content.count("INFO inside"), 2)
+        self.assertTrue(content.find("consumer") == -1)
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_exception_propagates(self):
+        @tim(log_file_name="test")
+        async def dummy(x):
+            raise ValueError(x)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(dummy(1))
+        self.assertTrue(
+            open("./test.log", "r").read().find("was executed in") == -1
+        )
+        self.addCleanup(os.remove, "./test.log")
+
+
+if __name__ == "__main__":
+    unittest.main()
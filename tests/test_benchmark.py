@@ -0,0 +1,189 @@
+from pyDecLog import get_logger
+from pyDecLog import timing
+from pyDecLog import description
+from pyDecLog import signature
+from pyDecLog import arguments
+from pyDecLog import message
+from pyDecLog import instrument
+from pyDecLog import configure
+from pyDecLog import close_all
+from pyDecLog import reset
+from pyDecLog import _build_logger
+from pyDecLog import LOG_FILE_NAME
+from pyDecLog import LOG_FILE_PATH
+from pyDecLog import CONSOLE_LOG_LEVEL
+import unittest
+import inspect
+import os
+import subprocess
+import sys
+from timeit import timeit
+
+# Number of repetitions used by every benchmark
+NUMBER = 2000
+
+# Allowed ratio between a decorated call and an undecorated call plus a
+# bare log emission
+OVERHEAD_BUDGET = float(os.environ.get("PYDECLOG_OVERHEAD_BUDGET", "3.0"))
+
+# Allowed cumulative import time of pyDecLog, in microseconds
+IMPORT_BUDGET = int(os.environ.get("PYDECLOG_IMPORT_BUDGET", "150000"))
+
+# Records written by the throughput benchmark
+RECORDS = 20000
+
+# Dependencies that must only be imported on first use
+LAZY_MODULES = ("numpy", "pympler", "psutil")
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_cached_logger_overhead(self):
+        def uncached():
+            # What get_logger used to do on every decorated call
+            logger = _build_logger(
+                LOG_FILE_NAME, LOG_FILE_PATH, CONSOLE_LOG_LEVEL
+            )
+            for handler in logger.handlers:
+                handler.close()
+
+        def cached():
+            get_logger(LOG_FILE_NAME, LOG_FILE_PATH, CONSOLE_LOG_LEVEL)
+
+        before = timeit(uncached, number=NUMBER) / NUMBER
+        after = timeit(cached, number=NUMBER) / NUMBER
+
+        print(
+            f"get_logger per call: before {before * 1e6:.2f} us, "
+            f"after {after * 1e6:.2f} us"
+        )
+        self.assertLess(after, before)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_wrapper_overhead(self):
+        def dummy(x):
+            return x
+
+        decorated = timing(dummy)
+        logger = get_logger(LOG_FILE_NAME, LOG_FILE_PATH, CONSOLE_LOG_LEVEL)
+
+        def reference():
+            dummy(1)
+            logger.debug("dummy was executed in: 0.0 sec")
+
+        # Warm up the cached logger and the log file
+        decorated(1)
+        expected = timeit(reference, number=NUMBER)
+        measured = timeit(lambda: decorated(1), number=NUMBER)
+
+        print(
+            f"@timing per call: {measured / NUMBER * 1e6:.2f} us, "
+            f"reference {expected / NUMBER * 1e6:.2f} us"
+        )
+        self.assertLess(measured, OVERHEAD_BUDGET * expected)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_instrument_overhead(self):
+        def dummy(first, second=2):
+            """Sum two numbers."""
+            print("Some message on console")
+            return first + second
+
+        stacked = description(signature(arguments(timing(message(dummy)))))
+        fused = instrument(
+            dummy,
+            aspects=(
+                "description",
+                "signature",
+                "arguments",
+                "timing",
+                "message",
+            ),
+        )
+
+        # Warm up the cached logger and the log file
+        stacked(1)
+        fused(1)
+        before = timeit(lambda: stacked(1), number=NUMBER)
+        after = timeit(lambda: fused(1), number=NUMBER)
+
+        print(
+            f"stacked decorators per call: {before / NUMBER * 1e6:.2f} us, "
+            f"@instrument {after / NUMBER * 1e6:.2f} us"
+        )
+        self.assertLess(after, before)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_signature_overhead(self):
+        def dummy(x):
+            return x
+
+        decorated = signature(dummy)
+        logger = get_logger(LOG_FILE_NAME, LOG_FILE_PATH, CONSOLE_LOG_LEVEL)
+
+        def reference():
+            # What @signature used to do on every call
+            logger.debug(f"Method's signature: {inspect.signature(dummy)}")
+            dummy(1)
+
+        decorated(1)
+        before = timeit(reference, number=NUMBER)
+        after = timeit(lambda: decorated(1), number=NUMBER)
+
+        print(
+            f"@signature per call: before {before / NUMBER * 1e6:.2f} us, "
+            f"after {after / NUMBER * 1e6:.2f} us"
+        )
+        self.assertLess(after, before)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_direct_throughput(self):
+        def throughput(backend):
+            configure(log_file_name="bench", backend=backend)
+            logger = get_logger("bench", LOG_FILE_PATH, CONSOLE_LOG_LEVEL)
+            logger.info("warm up")
+
+            def write():
+                for i in range(RECORDS):
+                    logger.info("record %d", i)
+                close_all()
+
+            return RECORDS / timeit(write, number=1)
+
+        self.addCleanup(reset)
+        before = throughput("sync")
+        after = throughput("direct")
+
+        print(
+            f"records/sec: FileHandler {before:,.0f}, "
+            f"direct backend {after:,.0f}"
+        )
+        self.assertGreater(after, before)
+        lines = open("./bench.log", "r").read().splitlines()
+        self.assertEqual(len(lines), 2 * (RECORDS + 1))
+        self.addCleanup(os.remove, "./bench.log")
+
+    def test_import_time(self):
+        def import_time():
+            # Each line reads: "import time: self | cumulative | module"
+            stderr = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", "import pyDecLog"],
+                capture_output=True,
+                text=True,
+            ).stderr
+            return {
+                line.split("|")[2].strip(): int(line.split("|")[1])
+                for line in stderr.splitlines()[1:]
+            }
+
+        # First run compiles the module
+        import_time()
+        modules = import_time()
+
+        print(f"pyDecLog import: {modules['pyDecLog']} us")
+        self.assertLess(modules["pyDecLog"], IMPORT_BUDGET)
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
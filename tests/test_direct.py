@@ -0,0 +1,136 @@
+from pyDecLog import timing as tim
+from pyDecLog import lprint
+from pyDecLog import configure
+from pyDecLog import read_records
+from pyDecLog import close_all
+from pyDecLog import reset
+import multiprocessing
+import threading
+import unittest
+import time
+import os
+
+
+def _work(n):
+    logger = lprint(log_file_name="test")
+    for i in range(n):
+        logger.info("worker %d record %d", os.getpid(), i)
+    close_all()
+
+
+class TestDirect(unittest.TestCase):
+    def setUp(self):
+        configure(log_file_name="test", backend="direct")
+
+    def tearDown(self):
+        reset()
+
+    def test_log_file_content(self):
+        lprint(log_file_name="test").info("simple message")
+        close_all()
+
+        self.assertTrue(
+            open("./test.log", "r").read().find("INFO simple message") != -1
+        )
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_flush_size(self):
+        configure(log_file_name="test", backend="direct", flush_size=100)
+        logger = lprint(log_file_name="test")
+        for i in range(10):
+            logger.info(f"message {i}")
+
+        # Written before the buffer is flushed by close_all
+        content = open("./test.log", "r").read()
+        self.assertIn("INFO message 0", content)
+        self.assertNotIn("INFO message 9", content)
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_flush_interval(self):
+        configure(log_file_name="test", backend="direct", flush_interval=0.05)
+        lprint(log_file_name="test").info("simple message")
+        time.sleep(0.3)
+
+        self.assertTrue(
+            open("./test.log", "r").read().find("INFO simple message") != -1
+        )
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_fsync(self):
+        configure(log_file_name="test", backend="direct", fsync="batch")
+        lprint(log_file_name="test").info("simple message")
+        close_all()
+
+        self.assertTrue(
+            open("./test.log", "r").read().find("INFO simple message") != -1
+        )
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_json(self):
+        configure(log_file_name="test", backend="direct", record_format="json")
+
+        @tim(log_file_name="test")
+        def dummy(x):
+            return x
+
+        dummy(1)
+        close_all()
+
+        records = list(read_records(log_file_name="test"))
+        self.assertEqual(records[0]["event"], "timing")
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_threads(self):
+        configure(log_file_name="test", backend="direct", flush_size=256)
+        logger = lprint(log_file_name="test")
+
+        def work():
+            for i in range(500):
+                logger.info(f"{threading.get_ident()} record {i}")
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        close_all()
+
+        lines = open("./test.log", "r").read().splitlines()
+        self.assertEqual(len(lines), 8 * 500)
+        for line in lines:
+            self.assertRegex(line, r"INFO \d+ record \d+$")
+        self.addCleanup(os.remove, "./test.log")
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "needs fork"
+    )
+    def test_processes(self):
+        # Buffered in the parent, must not be written again by the children
+        lprint(log_file_name="test").info("parent")
+
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=_work, args=(300,)) for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        close_all()
+
+        lines = open("./test.log", "r").read().splitlines()
+        self.assertEqual(len(lines), 1 + 4 * 300)
+        self.assertEqual(
+            sum(line.endswith("INFO parent") for line in lines), 1
+        )
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_options_not_known(self):
+        with self.assertRaises(TypeError):
+            configure(log_file_name="test", backend="direct", fsync="always")
+        with self.assertRaises(TypeError):
+            configure(log_file_name="test", backend="direct", max_bytes=10)
+
+
+if __name__ == "__main__":
+    unittest.main()
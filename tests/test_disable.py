@@ -0,0 +1,141 @@
+from pyDecLog import arguments as args
+from pyDecLog import message as mes
+from pyDecLog import memory as mem
+from pyDecLog import timing as tim
+from pyDecLog import get_logger
+from pyDecLog import disable
+from pyDecLog import enable
+from contextlib import redirect_stdout
+from io import StringIO
+import logging
+import unittest
+import os
+import subprocess
+import sys
+
+
+class Unprintable:
+    """Fail as soon as a decorator tries to format or size it."""
+
+    def __repr__(self):
+        raise AssertionError("Argument should not be formatted!")
+
+    __str__ = __repr__
+
+    def __sizeof__(self):
+        raise AssertionError("Argument should not be sized!")
+
+
+class TestDisable(unittest.TestCase):
+    def tearDown(self):
+        enable()
+        get_logger(log_file_name="test").setLevel(logging.NOTSET)
+
+    def test_same_function_return(self):
+        disable()
+
+        @tim
+        def dummy(x):
+            return x
+
+        self.assertEqual(dummy(1), 1)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_log_file_empty(self):
+        disable()
+
+        @tim(log_file_name="test")
+        def dummy(x):
+            return x
+
+        dummy(1)
+        self.assertTrue(os.stat("./test.log").st_size == 0)
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_enable(self):
+        disable()
+        enable()
+
+        @tim(log_file_name="test")
+        def dummy(x):
+            return x
+
+        dummy(1)
+        self.assertFalse(os.stat("./test.log").st_size == 0)
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_level_below_threshold(self):
+        get_logger(log_file_name="test").setLevel(logging.ERROR)
+
+        @args(log_file_name="test")
+        @mem(log_file_name="test")
+        def dummy(x):
+            return 1
+
+        self.assertEqual(dummy(Unprintable()), 1)
+        self.assertTrue(os.stat("./test.log").st_size == 0)
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_level_above_threshold(self):
+        get_logger(log_file_name="test").setLevel(logging.ERROR)
+
+        @args(level="error", log_file_name="test")
+        def dummy(x):
+            return x
+
+        dummy(1)
+        self.assertTrue(
+            open("./test.log", "r").read().find("ERROR Method's args:") != -1
+        )
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_logging_disable(self):
+        @args(level="critical", log_file_name="test")
+        def dummy(x):
+            return 1
+
+        dummy(1)
+        logging.disable(logging.CRITICAL)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        self.assertEqual(dummy(Unprintable()), 1)
+
+        logger = get_logger(log_file_name="test")
+        self.assertFalse(logger.isEnabledFor(logging.CRITICAL))
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_message_not_captured(self):
+        disable()
+
+        @mes(log_file_name="test")
+        def dummy(x):
+            print("Testing message!")
+            return x
+
+        s = StringIO()
+        with redirect_stdout(s):
+            dummy(1)
+
+        self.assertEqual(s.getvalue(), "Testing message!\n")
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_environment_variable(self):
+        code = (
+            "import pyDecLog; "
+            "pyDecLog.timing(log_file_name='test')(print)(1); "
+            "print(pyDecLog._DISABLED)"
+        )
+        env = dict(os.environ, PYDECLOG_DISABLE="1")
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            env=env,
+            capture_output=True,
+            text=True,
+        ).stdout
+
+        self.assertEqual(output, "1\nTrue\n")
+        self.assertTrue(os.stat("./test.log").st_size == 0)
+        self.addCleanup(os.remove, "./test.log")
+
+
+if __name__ == "__main__":
+    unittest.main()
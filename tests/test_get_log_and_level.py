@@ -1,7 +1,11 @@
 from pyDecLog import _get_log_level
 from pyDecLog import get_logger
+from pyDecLog import close_all
 import unittest
 import os
+import shutil
+import threading
+from unittest import mock
 
 LOG_FILE_NAME = "LOG"
 LOG_FILE_PATH = "./"
@@ -145,6 +149,98 @@ class TestlLogger(unittest.TestCase):
                 log_file_path=LOG_FILE_PATH,
             )
 
+    def test_get_log_is_cached(self):
+
+        first = get_logger(
+            log_file_name=LOG_FILE_NAME,
+            log_file_path=LOG_FILE_PATH,
+            console_log_level=CONSOLE_LOG_LEVEL,
+        )
+        second = get_logger(
+            log_file_name=LOG_FILE_NAME,
+            log_file_path=LOG_FILE_PATH,
+            console_log_level=CONSOLE_LOG_LEVEL,
+        )
+
+        self.assertIs(first, second)
+        self.assertEqual(len(second.handlers), 2)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_get_log_different_keys(self):
+
+        first = get_logger(log_file_name=LOG_FILE_NAME)
+        second = get_logger(log_file_name="test")
+
+        self.assertIsNot(first, second)
+        self.addCleanup(os.remove, "./LOG.log")
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_get_log_thread_safe(self):
+
+        loggers = []
+
+        def worker():
+            loggers.append(get_logger(log_file_name="test"))
+
+        close_all()
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(map(id, loggers))), 1)
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_close_all(self):
+
+        first = get_logger(log_file_name=LOG_FILE_NAME)
+        close_all()
+        second = get_logger(log_file_name=LOG_FILE_NAME)
+
+        self.assertIsNot(first, second)
+        self.assertTrue(first.handlers[0].stream is None)
+
+        # Logger bound before close_all still writes to its file
+        first.critical("after close!")
+        self.assertTrue(
+            open("./LOG.log", "r").read().find("after close!") != -1
+        )
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_log_file_recreated(self):
+
+        logger = get_logger(log_file_path="test_log_folder")
+        logger.critical("first message!")
+        shutil.rmtree("./test_log_folder")
+
+        get_logger(log_file_path="test_log_folder").critical("second message!")
+
+        self.assertTrue(
+            open("./test_log_folder/LOG.log", "r").read().find("second") != -1
+        )
+        self.addCleanup(shutil.rmtree, "./test_log_folder")
+
+    def test_log_file_checked_once(self):
+
+        logger = get_logger(log_file_path="test_log_folder")
+        logger.critical("first message!")
+        self.addCleanup(shutil.rmtree, "./test_log_folder")
+
+        with mock.patch("os.stat", wraps=os.stat) as stat:
+            for _ in range(100):
+                logger.critical("message!")
+
+        self.assertLessEqual(stat.call_count, 1)
+
+        # Checked again after close_all, once the file is gone
+        shutil.rmtree("./test_log_folder")
+        close_all()
+        logger.critical("second message!")
+        self.assertTrue(
+            open("./test_log_folder/LOG.log", "r").read().find("second") != -1
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
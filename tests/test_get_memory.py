@@ -1,6 +1,26 @@
 from pyDecLog import _get_mem
 import unittest
+from pyDecLog import _get_size
+from pyDecLog import register_size_estimator
 from pympler.asizeof import asizeof
+import numpy as np
+import sys
+
+
+class FakeFrame:
+    """Looks like a pandas DataFrame."""
+
+    dtypes = None
+
+    def memory_usage(self, deep=False):
+        return np.array([100, 200]) if deep else np.array([1, 2])
+
+
+class Walked:
+    """Sized by walking its references unless an estimator is registered."""
+
+    def __init__(self):
+        self.attribute = "x" * 1000
 
 
 class TestlGetMemory(unittest.TestCase):
@@ -38,6 +58,32 @@ class TestlGetMemory(unittest.TestCase):
             a = ["a"] * 1000
             _get_mem("pb", a)
 
+    def test_fast_paths(self):
+        data = b"x" * 1000
+        self.assertEqual(_get_size(data), sys.getsizeof(data))
+        self.assertEqual(_get_size("x" * 1000), sys.getsizeof("x" * 1000))
+        view = memoryview(data)[:10]
+        self.assertEqual(_get_size(view), 10 + sys.getsizeof(view))
+
+    def test_array(self):
+        array = np.zeros((100, 100))
+        self.assertEqual(_get_size(array), array.nbytes)
+
+    def test_memory_usage(self):
+        self.assertEqual(_get_size(FakeFrame()), 300)
+
+    def test_registered_estimator(self):
+        class Sub(Walked):
+            pass
+
+        register_size_estimator(Walked, lambda value: 42)
+        self.assertEqual(_get_size(Walked()), 42)
+        self.assertEqual(_get_size(Sub()), 42)
+
+    def test_immutable_container(self):
+        value = tuple(range(1000))
+        self.assertEqual(_get_size(value), asizeof(value))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,85 @@
+from pyDecLog import instrument
+from pyDecLog import configure
+from pyDecLog import read_records
+from pyDecLog import close_all
+from pyDecLog import reset
+import unittest
+import os
+
+
+@instrument(
+    aspects=("description", "signature", "arguments", "timing", "message")
+)
+def dummy(first, second=2):
+    """Sum two numbers."""
+    print("Some message on console")
+    return first + second
+
+
+class TestInstrument(unittest.TestCase):
+    def setUp(self):
+        # dummy keeps its handler across tests, which remove its file
+        close_all()
+
+    def test_same_function_return(self):
+        self.assertEqual(dummy(1, second=1), 2)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_one_line_per_call(self):
+        dummy(1)
+        dummy(2)
+        close_all()
+
+        lines = open("./LOG.log", "r").read().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].find("Method's description: Sum two") != -1)
+        self.assertTrue(lines[0].find("Method's args: (1,)") != -1)
+        self.assertTrue(lines[0].find("was executed in") != -1)
+        self.assertTrue(lines[0].find("Some message on console") != -1)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_structured_record(self):
+        configure(log_file_name="test", record_format="json")
+        self.addCleanup(reset)
+
+        @instrument(aspects=("timing", "typing"), log_file_name="test")
+        def square(x):
+            return x * x
+
+        square(3)
+        close_all()
+        self.addCleanup(os.remove, "./test.log")
+
+        (record,) = read_records(log_file_name="test")
+        self.assertEqual(record["event"], "instrument")
+        events = [r["event"] for r in record["records"]]
+        self.assertEqual(events, ["typing", "typing", "typing", "timing"])
+
+    def test_exception(self):
+        @instrument(aspects=("timing", "message"))
+        def fail():
+            print("before failing")
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            fail()
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_unknown_aspect(self):
+        with self.assertRaises(TypeError):
+            instrument(aspects=("timing", "colour"))
+
+    def test_unknown_memory_unit(self):
+        with self.assertRaises(TypeError):
+
+            @instrument(aspects=("memory",), memory_unit="kb")
+            def dummy(x):
+                return x
+
+    def test_positional_argument(self):
+        with self.assertRaises(RuntimeWarning):
+            instrument(1)
+
+
+if __name__ == "__main__":
+    unittest.main()
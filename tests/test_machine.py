@@ -1,9 +1,21 @@
 from pyDecLog import machine as mac
+from pyDecLog import reset
+from pyDecLog import _get_machine_facts
+from pyDecLog import _MACHINE_MONITORS
+import multiprocessing
 import unittest
 import os
 import shutil
 
 
+def _sample_in_child(dummy):
+    dummy(1)
+    # The snapshot comes from a thread of the child, sampling the child
+    monitor = _MACHINE_MONITORS[0.01]
+    alive = monitor.is_alive() and monitor._process.pid == os.getpid()
+    os._exit(0 if alive else 1)
+
+
 class TestMachine(unittest.TestCase):
     def test_same_function_return(self):
         @mac
@@ -122,6 +134,91 @@ class TestMachine(unittest.TestCase):
         self.assertTrue(os.path.exists("./test_log_folder/LOG.log"))
         self.addCleanup(shutil.rmtree, "./test_log_folder")
 
+    def test_logged_once(self):
+        @mac
+        def dummy(x):
+            return x
+
+        dummy(1)
+        dummy(2)
+        self.assertEqual(open("./LOG.log", "r").read().count("Platform:"), 1)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_logged_every_call(self):
+        @mac(once=False)
+        def dummy(x):
+            return x
+
+        dummy(1)
+        dummy(2)
+        self.assertEqual(open("./LOG.log", "r").read().count("Platform:"), 2)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_cached_facts(self):
+        self.assertIs(_get_machine_facts(), _get_machine_facts())
+
+    def test_snapshot(self):
+        @mac(snapshot_every=0.01)
+        def dummy(x):
+            return x
+
+        dummy(1)
+        dummy(2)
+        content = open("./LOG.log", "r").read()
+        self.assertEqual(content.count("Load average:"), 2)
+        self.assertTrue(content.find("open fds:") != -1)
+        self.assertTrue(_MACHINE_MONITORS[0.01].is_alive())
+
+        monitor = _MACHINE_MONITORS[0.01]
+        reset()
+        monitor.join(1)
+        self.assertFalse(monitor.is_alive())
+        self.addCleanup(os.remove, "./LOG.log")
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "needs fork"
+    )
+    def test_snapshot_forked(self):
+        @mac(snapshot_every=0.01)
+        def dummy(x):
+            return x
+
+        dummy(1)
+        context = multiprocessing.get_context("fork")
+        worker = context.Process(target=_sample_in_child, args=(dummy,))
+        worker.start()
+        worker.join()
+
+        self.assertEqual(worker.exitcode, 0)
+        reset()
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_resources(self):
+        @mac(resources=True)
+        def dummy(x):
+            sum(range(100_000))
+            return x
+
+        self.assertEqual(dummy(1), 1)
+        content = open("./LOG.log", "r").read()
+        self.assertTrue(content.find("Resources used: user CPU") != -1)
+        self.assertTrue(content.find("context switches") != -1)
+        self.assertTrue(content.find("page faults") != -1)
+        self.assertTrue(content.find("written") != -1)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_resources_exception(self):
+        @mac(resources=True)
+        def dummy(x):
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            dummy(1)
+        self.assertEqual(
+            open("./LOG.log", "r").read().count("Resources used"), 0
+        )
+        self.addCleanup(os.remove, "./LOG.log")
+
     def test_raise_run_time_warning(self):
 
         with self.assertRaises(RuntimeWarning):
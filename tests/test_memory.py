@@ -1,9 +1,21 @@
 from pyDecLog import memory as mem
+from pyDecLog import configure
+from pyDecLog import read_records
+from pyDecLog import close_all
+from pyDecLog import reset
+import multiprocessing
+import tracemalloc
 import unittest
 import os
 import shutil
 
 
+def _grow_in_child(grow):
+    grow(100 * 10**6)
+    close_all()
+    os._exit(0)
+
+
 class TestMemory(unittest.TestCase):
     def test_same_function_return(self):
         @mem
@@ -139,6 +151,97 @@ class TestMemory(unittest.TestCase):
         self.assertTrue(os.path.exists("./test_log_folder/LOG.log"))
         self.addCleanup(shutil.rmtree, "./test_log_folder")
 
+    def test_output_unit(self):
+        @mem(unit="mb")
+        def dummy():
+            return ["a"] * 1000
+
+        dummy()
+        self.assertTrue(
+            open("./LOG.log", "r").read().find("Size of output: 0.0") != -1
+        )
+        self.assertTrue(open("./LOG.log", "r").read().find("MBs") != -1)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_allocations(self):
+        configure(log_file_name="test", record_format="json")
+        self.addCleanup(reset)
+
+        @mem(allocations=True, top=3, log_file_name="test")
+        def dummy(x):
+            temporary = bytearray(4 * x)
+            del temporary
+            return bytearray(x)
+
+        dummy(1_000_000)
+        close_all()
+        self.addCleanup(os.remove, "./test.log")
+
+        records = list(read_records(log_file_name="test"))
+        (allocated,) = [r for r in records if "peak" in r]
+        self.assertGreaterEqual(allocated["allocated"], 1_000_000)
+        self.assertLess(allocated["allocated"], 2_000_000)
+        self.assertGreaterEqual(allocated["peak"], 4_000_000)
+        lines = [r for r in records if "lineno" in r]
+        self.assertEqual(lines[0]["filename"], __file__)
+
+    def test_allocations_traced_on_first_call(self):
+        self.addCleanup(reset)
+
+        @mem(allocations=True, level="debug", console_log_level="critical")
+        def dummy(x):
+            return x
+
+        self.assertFalse(tracemalloc.is_tracing())
+        dummy(1)
+        self.assertTrue(tracemalloc.is_tracing())
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_rss(self):
+        @mem(rss=True)
+        def dummy(x):
+            return x
+
+        dummy(1)
+        self.assertTrue(open("./LOG.log", "r").read().find("RSS change") != -1)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "needs fork"
+    )
+    def test_rss_forked(self):
+        configure(log_file_name="test", record_format="json")
+
+        @mem(rss=True, log_file_name="test")
+        def grow(n):
+            return b"x" * n
+
+        grow(1)
+        context = multiprocessing.get_context("fork")
+        worker = context.Process(target=_grow_in_child, args=(grow,))
+        worker.start()
+        worker.join()
+        reset()
+
+        # Read from the child, not from the parent
+        changes = [
+            record["rss"]
+            for record in read_records(log_file_name="test")
+            if "rss" in record
+        ]
+        self.assertEqual(len(changes), 2)
+        self.assertGreater(changes[1], 50 * 10**6)
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_raise_type_error(self):
+        with self.assertRaises(TypeError):
+
+            @mem(unit="pb")
+            def dummy(x):
+                return x
+
+        self.addCleanup(os.remove, "./LOG.log")
+
     def test_raise_run_time_warning(self):
 
         with self.assertRaises(RuntimeWarning):
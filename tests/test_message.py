@@ -2,6 +2,9 @@ from pyDecLog import message as mes
 import unittest
 import os
 import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 
 class TestMessage(unittest.TestCase):
@@ -126,6 +129,110 @@ class TestMessage(unittest.TestCase):
         self.assertTrue(os.path.exists("./test_log_folder/LOG.log"))
         self.addCleanup(shutil.rmtree, "./test_log_folder")
 
+    def test_lines_logged_while_running(self):
+        @mes
+        def dummy(x):
+            print("first line")
+            self.assertTrue(
+                open("./LOG.log", "r").read().find("INFO first line") != -1
+            )
+            return x
+
+        dummy(1)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_partial_lines(self):
+        @mes
+        def dummy(x):
+            print("start", end="")
+            print(" and end")
+            print("no newline", end="")
+            return x
+
+        dummy(1)
+        content = open("./LOG.log", "r").read()
+        self.assertTrue(content.find("INFO start and end") != -1)
+        self.assertTrue(content.find("INFO no newline") != -1)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_long_line(self):
+        @mes(max_line=10)
+        def dummy(x):
+            print("a" * 25)
+            return x
+
+        dummy(1)
+        lines = open("./LOG.log", "r").read().splitlines()
+        self.assertEqual([line[-10:] for line in lines][:2], ["a" * 10] * 2)
+        self.assertEqual(len(lines), 3)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_batch(self):
+        @mes(batch=3)
+        def dummy(x):
+            for i in range(4):
+                print(f"line {i}")
+            return x
+
+        dummy(1)
+        content = open("./LOG.log", "r").read()
+        self.assertEqual(content.count("INFO line"), 2)
+        self.assertTrue(content.find("INFO line 0\nline 1\nline 2") != -1)
+        self.assertTrue(content.find("INFO line 3") != -1)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_stderr(self):
+        @mes(stderr=True, console_log_level="info")
+        def dummy(x):
+            print("to stderr", file=sys.stderr)
+            return x
+
+        dummy(1)
+        self.assertTrue(
+            open("./LOG.log", "r").read().find("INFO to stderr") != -1
+        )
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_exception(self):
+        @mes
+        def dummy(x):
+            print("before failing")
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            dummy(1)
+        self.assertTrue(
+            open("./LOG.log", "r").read().find("INFO before failing") != -1
+        )
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_concurrent_threads(self):
+        workers = 8
+        calls = 50
+
+        def make(i):
+            @mes(log_file_name=f"test_{i}")
+            def dummy(j):
+                for k in range(3):
+                    print(f"worker {i} call {j} line {k}")
+                    time.sleep(0)
+                return j
+
+            return dummy
+
+        functions = [make(i) for i in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for j in range(calls):
+                for i, dummy in enumerate(functions):
+                    pool.submit(dummy, j)
+
+        for i in range(workers):
+            self.addCleanup(os.remove, f"./test_{i}.log")
+            lines = open(f"./test_{i}.log", "r").read().splitlines()
+            self.assertEqual(len(lines), 3 * calls)
+            for line in lines:
+                self.assertTrue(line.find(f"INFO worker {i} call") != -1)
+
     def test_raise_run_time_warning(self):
 
         with self.assertRaises(RuntimeWarning):
@@ -0,0 +1,146 @@
+from pyDecLog import timing as tim
+from pyDecLog import lprint
+from pyDecLog import configure
+from pyDecLog import read_records
+from pyDecLog import reset
+from pyDecLog import get_logger
+from pyDecLog import _AggregatorHandler
+import multiprocessing
+import unittest
+import logging
+import os
+import re
+
+
+def _work(n):
+    @tim(log_file_name="test")
+    def dummy(x):
+        return x
+
+    for i in range(n):
+        dummy(i)
+        lprint(log_file_name="test").info(
+            "worker %d record %d", os.getpid(), i
+        )
+
+
+@unittest.skipUnless(
+    "fork" in multiprocessing.get_all_start_methods(), "needs fork"
+)
+class TestProcess(unittest.TestCase):
+    def setUp(self):
+        configure(log_file_name="test", backend="process")
+
+    def tearDown(self):
+        reset()
+
+    def test_environment(self):
+        lprint(log_file_name="test").info("simple message")
+
+        self.assertIn("PYDECLOG_AGGREGATOR", os.environ)
+        reset()
+        self.assertNotIn("PYDECLOG_AGGREGATOR", os.environ)
+        self.assertTrue(
+            open("./test.log", "r").read().find("INFO simple message") != -1
+        )
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_workers(self):
+        lprint(log_file_name="test").info("parent")
+
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=_work, args=(200,)) for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        reset()
+
+        lines = open("./test.log", "r").read().splitlines()
+        self.assertEqual(len(lines), 1 + 4 * 200 * 2)
+        pattern = re.compile(
+            r"^\d{4}/\d\d/\d\d \| \d\d:\d\d:\d\d \| "
+            r"(INFO parent|INFO worker \d+ record \d+|"
+            r"DEBUG dummy was executed in: \S+ sec)$"
+        )
+        for line in lines:
+            self.assertRegex(line, pattern)
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_token(self):
+        lprint(log_file_name="test").info("simple message")
+
+        # A client without the token cannot make the writer open files
+        token, _, address = os.environ["PYDECLOG_AGGREGATOR"].partition("@")
+        handler = _AggregatorHandler(
+            "0" * len(token) + "@" + address, os.path.abspath("./other.log")
+        )
+        handler.emit(logging.makeLogRecord({"msg": "other message"}))
+        handler.close()
+        reset()
+
+        self.assertFalse(os.path.exists("./other.log"))
+        self.assertTrue(
+            open("./test.log", "r").read().find("INFO simple message") != -1
+        )
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_other_file(self):
+        lprint(log_file_name="test").info("simple message")
+
+        # Only the files configured with the process backend use it
+        handlers = get_logger(log_file_name="other").handlers
+        self.assertFalse(
+            any(
+                isinstance(handler, _AggregatorHandler) for handler in handlers
+            )
+        )
+        reset()
+        self.addCleanup(os.remove, "./test.log")
+        if os.path.exists("./other.log"):
+            self.addCleanup(os.remove, "./other.log")
+
+    def test_spawned_worker_first(self):
+        configure(
+            log_file_name="test", backend="process", record_format="json"
+        )
+        logger = lprint(log_file_name="test")
+
+        # The worker reaches the writer process first, with the options
+        # configured by its parent
+        context = multiprocessing.get_context("spawn")
+        worker = context.Process(target=_work, args=(3,))
+        worker.start()
+        worker.join()
+        logger.info("parent")
+        reset()
+
+        records = list(read_records(log_file_name="test"))
+        self.assertEqual(len(records), 1 + 3 * 2)
+        self.assertEqual(records[-1]["message"], "parent")
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_json(self):
+        configure(
+            log_file_name="test", backend="process", record_format="json"
+        )
+
+        @tim(log_file_name="test")
+        def dummy(x):
+            return x
+
+        dummy(1)
+        reset()
+
+        records = list(read_records(log_file_name="test"))
+        self.assertEqual(
+            records[0]["function"], "TestProcess.test_json.<locals>.dummy"
+        )
+        self.assertEqual(records[0]["event"], "timing")
+        self.addCleanup(os.remove, "./test.log")
+
+
+if __name__ == "__main__":
+    unittest.main()
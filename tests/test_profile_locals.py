@@ -1,5 +1,20 @@
 from pyDecLog import profile_locals as profile
+from pyDecLog import _MONITORED_RETURNS
 import unittest
+import gc
+import sys
+import threading
+
+
+def helper():
+    hidden = 5
+    return hidden
+
+
+# Backends available on this Python version
+BACKENDS = (
+    ("monitoring", "profile") if hasattr(sys, "monitoring") else ("profile",)
+)
 
 
 class TestProfileLocals(unittest.TestCase):
@@ -30,6 +45,107 @@ class TestProfileLocals(unittest.TestCase):
         dummy(1)
         self.assertTrue(dummy.locals["x"], 1)
 
+    def test_only_target_locals(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+
+                def dummy(x):
+                    total = helper() + x
+                    return total
+
+                dummy = profile(dummy, backend=backend)
+                self.assertEqual(dummy(1), 6)
+                self.assertEqual(dummy.locals, {"x": 1, "total": 6})
+
+    def test_previous_profiler_restored(self):
+        events = []
+
+        def previous(frame, event, arg):
+            events.append(event)
+
+        def dummy(x):
+            return x
+
+        dummy = profile(dummy, backend="profile")
+        sys.setprofile(previous)
+        try:
+            dummy(1)
+            current = sys.getprofile()
+        finally:
+            sys.setprofile(None)
+
+        self.assertIs(current, previous)
+        self.assertIn("return", events)
+        self.assertEqual(dummy.locals, {"x": 1})
+
+    def test_threads(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                barrier = threading.Barrier(4)
+                results = {}
+
+                def dummy(x):
+                    barrier.wait()
+                    value = x * 2
+                    return value
+
+                dummy = profile(dummy, backend=backend)
+
+                def run(x):
+                    dummy(x)
+                    results[x] = sys.getprofile()
+
+                threads = [
+                    threading.Thread(target=run, args=(i,)) for i in range(4)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+                self.assertEqual(set(results.values()), {None})
+                self.assertEqual(dummy.locals["value"], dummy.locals["x"] * 2)
+
+    @unittest.skipUnless(hasattr(sys, "monitoring"), "needs Python 3.12")
+    def test_same_function_twice(self):
+        def dummy(x):
+            total = x * 2
+            return total
+
+        first = profile(dummy, backend="monitoring")
+        second = profile(dummy, backend="monitoring")
+        first(1)
+        second(2)
+        self.assertEqual(first.locals["total"], 2)
+        self.assertEqual(second.locals["total"], 4)
+
+        # Wrappers are not kept alive, and the code is no longer monitored
+        # once none is left
+        del first
+        gc.collect()
+        second(3)
+        self.assertEqual(second.locals["total"], 6)
+        self.assertEqual(len(_MONITORED_RETURNS[dummy.__code__]), 1)
+        del second
+        gc.collect()
+        self.assertNotIn(dummy.__code__, _MONITORED_RETURNS)
+
+    @unittest.skipUnless(hasattr(sys, "monitoring"), "needs Python 3.12")
+    def test_reserved_tool_ids_left(self):
+        profile(helper, backend="monitoring")()
+
+        monitoring = sys.monitoring
+        for tool in (
+            monitoring.DEBUGGER_ID,
+            monitoring.COVERAGE_ID,
+            monitoring.OPTIMIZER_ID,
+        ):
+            self.assertNotEqual(monitoring.get_tool(tool), "pyDecLog")
+
+    def test_raise_type_error(self):
+        with self.assertRaises(TypeError):
+            profile(helper, backend="settrace")
+
 
 if __name__ == "__main__":
     unittest.main()
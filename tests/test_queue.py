@@ -0,0 +1,148 @@
+from pyDecLog import timing as tim
+from pyDecLog import arguments as arg
+from pyDecLog import read_records
+from pyDecLog import lprint
+from pyDecLog import get_logger
+from pyDecLog import configure
+from pyDecLog import dropped_records
+from pyDecLog import close_all
+from pyDecLog import reset
+from pyDecLog import _file_handlers
+import multiprocessing
+import unittest
+import os
+
+
+def _work(n):
+    logger = lprint(log_file_name="test")
+    for i in range(n):
+        logger.info(f"child record {i}")
+    close_all()
+
+
+class TestQueue(unittest.TestCase):
+    def setUp(self):
+        configure(log_file_name="test", backend="queue")
+
+    def tearDown(self):
+        reset()
+
+    def test_log_file_content(self):
+        lprint(log_file_name="test").info("simple message")
+        close_all()
+
+        self.assertTrue(
+            open("./test.log", "r").read().find("INFO simple message") != -1
+        )
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_decorated_before_configure(self):
+        configure(log_file_name="test")
+
+        @tim(log_file_name="test")
+        def dummy(x):
+            return x
+
+        configure(log_file_name="test", backend="queue")
+        dummy(1)
+        get_logger(log_file_name="test").handlers[0].flush()
+
+        self.assertTrue(
+            open("./test.log", "r").read().find("was executed in") != -1
+        )
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_write_after_close(self):
+        logger = lprint(log_file_name="test")
+        close_all()
+        logger.info("after close")
+        logger.handlers[0].flush()
+
+        self.assertTrue(
+            open("./test.log", "r").read().find("INFO after close") != -1
+        )
+        self.addCleanup(os.remove, "./test.log")
+
+    def _fill(self, overflow):
+        configure(
+            log_file_name="test",
+            backend="queue",
+            queue_size=2,
+            overflow=overflow,
+        )
+        logger = get_logger(log_file_name="test")
+
+        # Stall the writer thread on the file handler lock
+        handler = _file_handlers(logger)[0]
+        handler.acquire()
+        try:
+            for i in range(10):
+                logger.info(f"message {i}")
+        finally:
+            handler.release()
+        logger.handlers[0].flush()
+
+        return open("./test.log", "r").read()
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "needs fork"
+    )
+    def test_forked_child(self):
+        lprint(log_file_name="test").info("parent")
+
+        context = multiprocessing.get_context("fork")
+        worker = context.Process(target=_work, args=(3,))
+        worker.start()
+        worker.join()
+        close_all()
+
+        lines = open("./test.log", "r").read().splitlines()
+        self.assertEqual(len(lines), 4)
+        for i in range(3):
+            self.assertEqual(
+                sum(line.endswith(f"INFO child record {i}") for line in lines),
+                1,
+            )
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_json_arguments_rendered_at_call(self):
+        configure(log_file_name="test", backend="queue", record_format="json")
+
+        @arg(log_file_name="test")
+        def dummy(x):
+            return x
+
+        value = [1, 2, 3]
+        dummy(value)
+        value.append("changed after the call")
+        close_all()
+
+        records = list(read_records(log_file_name="test"))
+        self.assertEqual(records[1]["args"], [[1, 2, 3]])
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_drop_newest(self):
+        content = self._fill("drop-newest")
+
+        self.assertIn(dropped_records(log_file_name="test"), (7, 8))
+        self.assertTrue(content.find("message 9") == -1)
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_drop_oldest(self):
+        content = self._fill("drop-oldest")
+
+        self.assertIn(dropped_records(log_file_name="test"), (7, 8))
+        self.assertTrue(content.find("message 9") != -1)
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_raise_type_error(self):
+
+        with self.assertRaises(TypeError):
+            configure(backend="disk")
+
+        with self.assertRaises(TypeError):
+            configure(backend="queue", overflow="ignore")
+
+
+if __name__ == "__main__":
+    unittest.main()
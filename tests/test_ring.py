@@ -0,0 +1,219 @@
+from pyDecLog import timing as tim
+from pyDecLog import arguments as arg
+from pyDecLog import lprint
+from pyDecLog import configure
+from pyDecLog import read_records
+from pyDecLog import close_all
+from pyDecLog import reset
+import multiprocessing
+import subprocess
+import unittest
+import signal
+import json
+import sys
+import os
+
+
+def _crash(n):
+    logger = lprint(log_file_name="test")
+    for i in range(n):
+        logger.info(f"child record {i}")
+    # Nothing is flushed or closed
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+def _share(n, barrier):
+    configure(
+        log_file_name="test",
+        backend="ring",
+        ring_size=64 + 1000 * 512,
+        slot_size=512,
+    )
+    logger = lprint(log_file_name="test")
+    for i in range(n):
+        logger.info(f"worker {os.getpid()} record {i}")
+    # Both processes hold the ring at once
+    barrier.wait()
+    close_all()
+
+
+class TestRing(unittest.TestCase):
+    def setUp(self):
+        configure(
+            log_file_name="test",
+            backend="ring",
+            ring_size=64 + 8 * 512,
+            slot_size=512,
+        )
+        self.addCleanup(os.remove, "./test.ring")
+
+    def tearDown(self):
+        reset()
+
+    def _messages(self):
+        return [r["message"] for r in read_records("test", "./", "ring")]
+
+    def test_timing(self):
+        @tim(log_file_name="test")
+        def dummy(x):
+            return x
+
+        dummy(1)
+        close_all()
+
+        records = list(read_records("test", "./", "ring"))
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["event"], "timing")
+        self.assertIn("dummy was executed in", records[0]["message"])
+
+    def test_arguments(self):
+        @arg(log_file_name="test")
+        def dummy(x, y=2):
+            return x
+
+        dummy(1, y=3)
+        close_all()
+
+        records = list(read_records("test", "./", "ring"))
+        self.assertEqual(records[1]["args"], [1])
+        self.assertEqual(records[2]["kwargs"], {"y": 3})
+
+    def test_wrap_around(self):
+        logger = lprint(log_file_name="test")
+        for i in range(20):
+            logger.info(f"message {i}")
+        close_all()
+
+        self.assertEqual(
+            self._messages(), [f"message {i}" for i in range(12, 20)]
+        )
+
+    def test_reopen(self):
+        lprint(log_file_name="test").info("first run")
+        close_all()
+        lprint(log_file_name="test").info("second run")
+        close_all()
+
+        self.assertEqual(self._messages(), ["first run", "second run"])
+
+    def test_shared_after_close_all(self):
+        @tim(log_file_name="test")
+        def dummy(x):
+            return x
+
+        lprint(log_file_name="test").info("first")
+        dummy(1)
+        close_all()
+        # The decorator keeps its logger, lprint builds a new one
+        dummy(2)
+        lprint(log_file_name="test").info("second")
+        dummy(3)
+        close_all()
+
+        messages = self._messages()
+        self.assertEqual(len(messages), 5)
+        self.assertEqual(messages[0], "first")
+        self.assertEqual(messages[3], "second")
+        for i in (1, 2, 4):
+            self.assertIn("dummy was executed in", messages[i])
+
+    def test_truncated(self):
+        configure(
+            log_file_name="test",
+            backend="ring",
+            ring_size=64 + 4 * 128,
+            slot_size=128,
+        )
+        lprint(log_file_name="test").info("x" * 1000)
+        close_all()
+
+        record = list(read_records("test", "./", "ring"))[0]
+        self.assertTrue(record["truncated"])
+        self.assertTrue(record["message"].startswith("xxx"))
+        self.assertEqual(record["level"], "INFO")
+
+    def test_torn_slot(self):
+        logger = lprint(log_file_name="test")
+        for i in range(3):
+            logger.info(f"message {i}")
+        close_all()
+
+        # A crash between the payload and the sequence number of a slot
+        with open("./test.ring", "r+b") as f:
+            f.seek(64 + 512)
+            f.write(b"\0" * 8)
+
+        self.assertEqual(self._messages(), ["message 0", "message 2"])
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "needs fork"
+    )
+    def test_crash(self):
+        lprint(log_file_name="test").info("parent")
+
+        context = multiprocessing.get_context("fork")
+        worker = context.Process(target=_crash, args=(3,))
+        worker.start()
+        worker.join()
+        close_all()
+
+        self.assertEqual(worker.exitcode, -signal.SIGKILL)
+        self.assertEqual(
+            self._messages(),
+            ["parent"] + [f"child record {i}" for i in range(3)],
+        )
+        self.addCleanup(os.remove, f"./test.{worker.pid}.ring")
+
+    def test_spawned_processes(self):
+        context = multiprocessing.get_context("spawn")
+        barrier = context.Barrier(2)
+        workers = [
+            context.Process(target=_share, args=(300, barrier))
+            for _ in range(2)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        for worker in workers:
+            path = f"./test.{worker.pid}.ring"
+            if os.path.exists(path):
+                self.addCleanup(os.remove, path)
+
+        self.assertEqual([worker.exitcode for worker in workers], [0, 0])
+        messages = self._messages()
+        self.assertEqual(len(messages), 2 * 300)
+        for worker in workers:
+            self.assertIn(f"worker {worker.pid} record 299", messages)
+
+    def test_reader(self):
+        lprint(log_file_name="test").info("simple message")
+        close_all()
+
+        module = os.path.join(os.path.dirname(__file__), "pyDecLog.py")
+        text = subprocess.run(
+            [sys.executable, module, "test.ring"],
+            capture_output=True,
+            text=True,
+        ).stdout
+        self.assertRegex(
+            text, r"^\d{4}/\d\d/\d\d \| \d\d:\d\d:\d\d \| INFO simple message"
+        )
+
+        lines = subprocess.run(
+            [sys.executable, module, "test.ring", "--json"],
+            capture_output=True,
+            text=True,
+        ).stdout.splitlines()
+        self.assertEqual(json.loads(lines[0])["message"], "simple message")
+
+    def test_slot_size(self):
+        lprint(log_file_name="test").info("simple message")
+        close_all()
+
+        with self.assertRaises(ValueError):
+            configure(log_file_name="test", backend="ring", slot_size=16)
+
+
+if __name__ == "__main__":
+    unittest.main()
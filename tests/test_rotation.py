@@ -0,0 +1,144 @@
+from pyDecLog import lprint
+from pyDecLog import configure
+from pyDecLog import close_all
+from pyDecLog import reset
+import multiprocessing
+import unittest
+import shutil
+import gzip
+import time
+import os
+
+FOLDER = "./test_rotation/"
+
+
+def _segments():
+    return sorted(
+        entry
+        for entry in os.listdir(FOLDER)
+        if entry.startswith("test.log.") and entry != "test.log.lock"
+    )
+
+
+def _lines():
+    lines = []
+    for entry in _segments() + ["test.log"]:
+        path = os.path.join(FOLDER, entry)
+        opener = gzip.open if entry.endswith(".gz") else open
+        with opener(path, "rt") as f:
+            lines.extend(f.read().splitlines())
+    return lines
+
+
+def _work(n):
+    logger = lprint(log_file_name="test", log_file_path=FOLDER)
+    for i in range(n):
+        logger.info("worker %d record %d", os.getpid(), i)
+
+
+class TestRotation(unittest.TestCase):
+    def setUp(self):
+        os.makedirs(FOLDER, exist_ok=True)
+        self.addCleanup(shutil.rmtree, FOLDER)
+
+    def tearDown(self):
+        reset()
+
+    def test_max_bytes(self):
+        configure(
+            log_file_name="test",
+            log_file_path=FOLDER,
+            max_bytes=500,
+            backup_count=3,
+        )
+        logger = lprint(log_file_name="test", log_file_path=FOLDER)
+        for i in range(100):
+            logger.info(f"message {i}")
+        close_all()
+
+        self.assertEqual(len(_segments()), 3)
+        for entry in _segments():
+            self.assertLess(os.path.getsize(os.path.join(FOLDER, entry)), 600)
+        self.assertTrue(_lines()[-1].endswith("INFO message 99"))
+
+    def test_compression(self):
+        configure(
+            log_file_name="test",
+            log_file_path=FOLDER,
+            max_bytes=500,
+            backup_count=100,
+            compression="gzip",
+        )
+        logger = lprint(log_file_name="test", log_file_path=FOLDER)
+        for i in range(100):
+            logger.info(f"message {i}")
+        reset()
+
+        self.assertTrue(_segments())
+        self.assertTrue(all(entry.endswith(".gz") for entry in _segments()))
+        lines = _lines()
+        self.assertEqual(len(lines), 100)
+        self.assertTrue(lines[0].endswith("INFO message 0"))
+
+    def test_rotate_every(self):
+        configure(log_file_name="test", log_file_path=FOLDER, rotate_every=0.2)
+        logger = lprint(log_file_name="test", log_file_path=FOLDER)
+        logger.info("first")
+        time.sleep(0.25)
+        logger.info("second")
+        close_all()
+
+        self.assertEqual(len(_segments()), 1)
+        self.assertEqual(len(_lines()), 2)
+        with open(os.path.join(FOLDER, "test.log")) as f:
+            self.assertTrue(f.read().endswith("INFO second\n"))
+
+    def test_file_from_earlier_period(self):
+        path = os.path.join(FOLDER, "test.log")
+        with open(path, "w") as f:
+            f.write("old record\n")
+        os.utime(path, (time.time() - 7200, time.time() - 7200))
+
+        configure(
+            log_file_name="test", log_file_path=FOLDER, rotate_every=3600
+        )
+        lprint(log_file_name="test", log_file_path=FOLDER).info("new record")
+        close_all()
+
+        self.assertEqual(len(_segments()), 1)
+        with open(path) as f:
+            self.assertNotIn("old record", f.read())
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "needs fork"
+    )
+    def test_processes(self):
+        configure(
+            log_file_name="test",
+            log_file_path=FOLDER,
+            max_bytes=2000,
+            backup_count=1000,
+        )
+        close_all()
+
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=_work, args=(300,)) for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        lines = _lines()
+        self.assertEqual(len(lines), 4 * 300)
+        for line in lines:
+            self.assertRegex(line, r"INFO worker \d+ record \d+$")
+
+    def test_compression_not_known(self):
+        with self.assertRaises(TypeError):
+            configure(log_file_name="test", max_bytes=10, compression="zip")
+
+
+if __name__ == "__main__":
+    unittest.main()
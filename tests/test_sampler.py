@@ -0,0 +1,92 @@
+from pyDecLog import arguments as args
+from pyDecLog import memory as mem
+from pyDecLog import typing as typ
+from pyDecLog import Sampler
+import unittest
+import os
+
+
+class Unsizable:
+    """Fail as soon as a decorator tries to size it."""
+
+    def __sizeof__(self):
+        raise AssertionError("Argument should not be sized!")
+
+
+class TestSampler(unittest.TestCase):
+    def test_same_function_return(self):
+        @args(sampler=Sampler(rate=0.0))
+        def dummy(x):
+            return x
+
+        self.assertEqual(dummy(1), 1)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_every_n(self):
+        @args(log_file_name="test", sampler=Sampler(every_n=3))
+        def dummy(x):
+            return x
+
+        for i in range(9):
+            dummy(i)
+        content = open("./test.log", "r").read()
+
+        self.assertEqual(content.count("Method's args"), 3)
+        self.assertTrue(content.find("Method's args: (0,)") != -1)
+        self.assertTrue(content.find("Method's args: (3,)") != -1)
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_rate_is_reproducible(self):
+        @typ(log_file_name="test_a", sampler=Sampler(rate=0.3, seed=7))
+        def first(x):
+            return x
+
+        @typ(log_file_name="test_b", sampler=Sampler(rate=0.3, seed=7))
+        def second(x):
+            return x
+
+        for i in range(200):
+            first(i)
+            second(i)
+        count_a = open("./test_a.log", "r").read().count("Type of output")
+        count_b = open("./test_b.log", "r").read().count("Type of output")
+
+        self.assertEqual(count_a, count_b)
+        self.assertGreater(count_a, 30)
+        self.assertLess(count_a, 90)
+        self.addCleanup(os.remove, "./test_a.log")
+        self.addCleanup(os.remove, "./test_b.log")
+
+    def test_max_per_second(self):
+        @args(log_file_name="test", sampler=Sampler(max_per_second=5))
+        def dummy(x):
+            return x
+
+        for i in range(100):
+            dummy(i)
+
+        self.assertLessEqual(
+            open("./test.log", "r").read().count("Method's args"), 6
+        )
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_not_sampled_call_not_sized(self):
+        @mem(log_file_name="test", sampler=Sampler(rate=0.0))
+        def dummy(x):
+            return 1
+
+        self.assertEqual(dummy(Unsizable()), 1)
+        self.assertTrue(os.stat("./test.log").st_size == 0)
+        self.addCleanup(os.remove, "./test.log")
+
+    def test_raise_value_error(self):
+
+        with self.assertRaises(ValueError):
+            Sampler(rate=2.0)
+
+        with self.assertRaises(ValueError):
+            Sampler(every_n=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
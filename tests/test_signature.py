@@ -1,4 +1,5 @@
 from pyDecLog import signature as sign
+from pyDecLog import _get_signature
 import unittest
 import os
 import shutil
@@ -121,6 +122,43 @@ class TestSignature(unittest.TestCase):
         self.assertTrue(os.path.exists("./test_log_folder/LOG.log"))
         self.addCleanup(shutil.rmtree, "./test_log_folder")
 
+    def test_logged_once(self):
+        @sign
+        def dummy(x):
+            return x
+
+        dummy(1)
+        dummy(2)
+        self.assertEqual(
+            open("./LOG.log", "r").read().count("Method's signature:"), 1
+        )
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_logged_every_call(self):
+        @sign(once=False)
+        def dummy(x):
+            return x
+
+        dummy(1)
+        dummy(2)
+        self.assertEqual(
+            open("./LOG.log", "r").read().count("Method's signature:"), 2
+        )
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_cached_signature(self):
+        def dummy(x: int, y=2) -> int:
+            return x
+
+        signature = _get_signature(dummy)
+        self.assertIs(_get_signature(dummy), signature)
+        self.assertEqual(signature.text, "(x: int, y=2) -> int")
+        self.assertEqual(signature.parameters, ("x", "y"))
+        self.assertEqual(signature.annotations, {"x": int, "return": int})
+
+    def test_builtin_without_signature(self):
+        self.assertEqual(_get_signature(max).text, "(...)")
+
     def test_raise_run_time_warning(self):
 
         with self.assertRaises(RuntimeWarning):
@@ -0,0 +1,145 @@
+from pyDecLog import timing as tim
+from pyDecLog import arguments
+from pyDecLog import memory
+from pyDecLog import typing as typ
+from pyDecLog import lprint
+from pyDecLog import configure
+from pyDecLog import read_records
+from pyDecLog import close_all
+from pyDecLog import reset
+from pyDecLog import _pack
+from pyDecLog import _unpack
+import unittest
+import os
+
+
+class TestStructured(unittest.TestCase):
+    def tearDown(self):
+        reset()
+
+    def test_json_timing(self):
+        configure(log_file_name="test", record_format="json")
+
+        @tim(unit="ns", log_file_name="test")
+        def dummy(x):
+            return x
+
+        dummy(1)
+        close_all()
+        self.addCleanup(os.remove, "./test.log")
+
+        (record,) = read_records(log_file_name="test")
+        self.assertEqual(record["function"], dummy.__qualname__)
+        self.assertEqual(record["event"], "timing")
+        self.assertEqual(record["level"], "DEBUG")
+        self.assertIsInstance(record["duration_ns"], int)
+        self.assertIn("was executed in", record["message"])
+
+    def test_json_arguments(self):
+        configure(log_file_name="test", record_format="json")
+
+        @arguments(log_file_name="test")
+        def dummy(x, y=None):
+            return x
+
+        dummy(1, y=object())
+        close_all()
+        self.addCleanup(os.remove, "./test.log")
+
+        records = list(read_records(log_file_name="test"))
+        self.assertEqual(records[1]["args"], [1])
+        self.assertTrue(records[2]["kwargs"]["y"].startswith("<object"))
+
+    def test_json_typing(self):
+        configure(log_file_name="test", record_format="json")
+
+        @typ(log_file_name="test")
+        def dummy(x, y=None):
+            return x
+
+        dummy(1, y=[1, 2])
+        close_all()
+        self.addCleanup(os.remove, "./test.log")
+
+        records = list(read_records(log_file_name="test"))
+        self.assertEqual(records[1]["type"], "int")
+        self.assertEqual(records[2]["kwarg"], "y")
+        self.assertEqual(records[2]["type"], "list")
+
+    def test_json_bounded_arguments(self):
+        configure(log_file_name="test", record_format="json")
+
+        @arguments(log_file_name="test", max_items=3)
+        def dummy(x):
+            return x
+
+        dummy(list(range(1000)))
+        close_all()
+        self.addCleanup(os.remove, "./test.log")
+
+        records = list(read_records(log_file_name="test"))
+        self.assertEqual(records[1]["args"], [[0, 1, 2, "... (len=1000)"]])
+
+    def test_binary_memory(self):
+        configure(log_file_name="test", record_format="binary")
+
+        @memory(log_file_name="test")
+        def dummy(x):
+            return x
+
+        dummy(1)
+        lprint(log_file_name="test").info("plain message")
+        close_all()
+        self.addCleanup(os.remove, "./test.log")
+
+        records = list(
+            read_records(log_file_name="test", record_format="binary")
+        )
+        self.assertEqual(records[1]["event"], "memory")
+        self.assertEqual(records[1]["arg"], 0)
+        self.assertIn("size", records[1])
+        self.assertEqual(records[-1]["message"], "plain message")
+        self.assertNotIn("event", records[-1])
+
+    def test_binary_queue(self):
+        configure(
+            log_file_name="test", backend="queue", record_format="binary"
+        )
+
+        @tim(log_file_name="test")
+        def dummy(x):
+            return x
+
+        for i in range(10):
+            dummy(i)
+        close_all()
+        self.addCleanup(os.remove, "./test.log")
+
+        records = list(
+            read_records(log_file_name="test", record_format="binary")
+        )
+        self.assertEqual(len(records), 10)
+
+    def test_pack_round_trip(self):
+        value = {
+            "a": [None, True, False, 0, 127, 128, -1, 2**40, 1.5],
+            "b": "héllo",
+            "c": b"\x00\xff",
+            "d": (1, 2),
+        }
+        decoded, offset = _unpack(_pack(value))
+        self.assertEqual(offset, len(_pack(value)))
+        self.assertEqual(decoded["a"], value["a"])
+        self.assertEqual(decoded["b"], value["b"])
+        self.assertEqual(decoded["c"], value["c"])
+        self.assertEqual(decoded["d"], [1, 2])
+
+    def test_unknown_format(self):
+        with self.assertRaises(TypeError):
+            configure(log_file_name="test", record_format="xml")
+        with self.assertRaises(TypeError):
+            list(read_records(log_file_name="test", record_format="text"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,13 @@
 from pyDecLog import timing as tim
+from pyDecLog import get_timing_stats
+from pyDecLog import reset_timing_stats
+from pyDecLog import _Sketch
 import unittest
+import gc
 import os
 import shutil
+import threading
+import time
 
 
 class TestTiming(unittest.TestCase):
@@ -139,6 +145,155 @@ class TestTiming(unittest.TestCase):
             def dummy(x):
                 return x
 
+    def test_log_file_content_for_time_in_NS_string(self):
+        @tim(unit="ns")
+        def dummy(x):
+            return x
+
+        dummy(1)
+        content = open("./LOG.log", "r").read()
+        elapsed = content.split("executed in: ")[1].split()[0]
+
+        self.assertTrue(elapsed.isdigit())
+        self.assertGreater(int(elapsed), 0)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_log_file_content_for_time_in_US_string(self):
+        @tim(unit="us")
+        def dummy(x):
+            time.sleep(0.0001)
+            return x
+
+        dummy(1)
+        content = open("./LOG.log", "r").read()
+        elapsed = float(content.split("executed in: ")[1].split()[0])
+
+        self.assertGreaterEqual(elapsed, 100)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_log_file_content_for_cpu_time(self):
+        @tim(unit="ms", cpu_time=True)
+        def dummy(x):
+            time.sleep(0.05)
+            return x
+
+        dummy(1)
+        content = open("./LOG.log", "r").read()
+        process = float(content.split("process CPU: ")[1].split()[0])
+
+        self.assertTrue(content.find("thread CPU:") != -1)
+        self.assertLess(process, 50)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_raise_type_error(self):
+
+        with self.assertRaises(TypeError):
+
+            @tim(unit="year")
+            def dummy(x):
+                return x
+
+    def test_aggregate_every_n(self):
+        @tim(aggregate=True, every_n=10)
+        def dummy(x):
+            return x
+
+        for i in range(25):
+            dummy(i)
+        content = open("./LOG.log", "r").read()
+
+        self.assertTrue(content.find("was executed in") == -1)
+        self.assertEqual(content.count("timing over"), 2)
+        self.assertTrue(content.find("timing over 20 calls") != -1)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_aggregate_every_sec(self):
+        @tim(aggregate=True, every_n=0, every_sec=0.05)
+        def dummy(x):
+            return x
+
+        dummy(1)
+        time.sleep(0.06)
+        dummy(1)
+
+        self.assertTrue(
+            open("./LOG.log", "r").read().find("timing over 2 calls") != -1
+        )
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_aggregate_stats(self):
+        @tim(aggregate=True)
+        def dummy(x):
+            time.sleep(x)
+
+        for x in (0.001, 0.002, 0.003):
+            dummy(x)
+        name = f"{__name__}.{dummy.__qualname__}"
+        stats = get_timing_stats()[name]
+
+        self.assertEqual(stats["count"], 3)
+        self.assertGreaterEqual(stats["min"], 1e6)
+        self.assertLessEqual(stats["min"], stats["p50"])
+        self.assertLessEqual(stats["p50"], stats["p99"] * 1.01)
+        self.assertLessEqual(stats["p99"], stats["max"] * 1.01)
+        self.assertAlmostEqual(
+            stats["mean"], stats["sum"] / stats["count"], places=9
+        )
+
+        reset_timing_stats()
+        self.assertEqual(get_timing_stats()[name]["count"], 0)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_aggregate_threads(self):
+        @tim(aggregate=True, every_n=0)
+        def dummy(x):
+            return x
+
+        def worker():
+            for i in range(100):
+                dummy(i)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        name = f"{__name__}.{dummy.__qualname__}"
+
+        self.assertEqual(get_timing_stats()[name]["count"], 400)
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_aggregate_closures(self):
+        def factory():
+            @tim(aggregate=True, every_n=0)
+            def dummy(x):
+                return x
+
+            return dummy
+
+        first, second = factory(), factory()
+        for i in range(3):
+            first(i)
+        second(1)
+        name = f"{__name__}.{first.__qualname__}"
+
+        self.assertEqual(get_timing_stats()[name]["count"], 4)
+        reset_timing_stats()
+        self.assertEqual(get_timing_stats()[name]["count"], 0)
+
+        del first, second
+        gc.collect()
+        self.assertNotIn(name, get_timing_stats())
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_sketch_quantiles(self):
+        sketch = _Sketch(alpha=0.01)
+        for value in range(1, 1001):
+            sketch.add(value)
+
+        self.assertAlmostEqual(sketch.quantile(0.5), 500, delta=5)
+        self.assertAlmostEqual(sketch.quantile(0.99), 990, delta=10)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -46,6 +46,21 @@ class TestTipying(unittest.TestCase):
         )
         self.addCleanup(os.remove, "./LOG.log")
 
+    def test_log_file_content_for_keyword_argument(self):
+        @typ
+        def dummy(x, y=None):
+            "Do nothing"
+            return x
+
+        dummy(1, y=[1, 2])
+        self.assertTrue(
+            open("./LOG.log", "r")
+            .read()
+            .find("DEBUG Keyword argument's type: y: <class 'list'>")
+            != -1
+        )
+        self.addCleanup(os.remove, "./LOG.log")
+
     def test_log_CRITICAL_file(self):
         @typ(level="critical")
         def dummy(x, test=False):
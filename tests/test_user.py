@@ -1,4 +1,9 @@
 from pyDecLog import user
+from pyDecLog import _get_user_identity
+from pyDecLog import _get_user_name
+from pyDecLog import _get_container_id
+from pyDecLog import _forget_user_identity
+from unittest import mock
 import unittest
 import os
 import shutil
@@ -123,6 +128,57 @@ class TestUser(unittest.TestCase):
         self.assertTrue(os.path.exists("./test_log_folder/LOG.log"))
         self.addCleanup(shutil.rmtree, "./test_log_folder")
 
+    def test_log_file_content_for_pid(self):
+        @user
+        def dummy(x):
+            return x
+
+        dummy(1)
+        self.assertTrue(
+            open("./LOG.log", "r").read().find(f"pid: {os.getpid()}") != -1
+        )
+        self.addCleanup(os.remove, "./LOG.log")
+
+    def test_cached_identity(self):
+        self.assertIs(_get_user_identity(), _get_user_identity())
+
+    def test_no_terminal(self):
+        self.addCleanup(_forget_user_identity)
+        _forget_user_identity()
+        with mock.patch("os.getlogin", side_effect=OSError(6, "No tty")):
+            message, fields = _get_user_identity()
+        self.assertNotEqual(fields["user"], "")
+        self.assertTrue(message.startswith(f"User: {fields['user']}"))
+
+    def test_environment_fallback(self):
+        with mock.patch(
+            "os.getlogin", side_effect=OSError(6, "No tty")
+        ), mock.patch("pwd.getpwuid", side_effect=KeyError), mock.patch.dict(
+            os.environ, {"LOGNAME": "somebody"}
+        ):
+            self.assertEqual(_get_user_name(), "somebody")
+
+    def test_container_id(self):
+        container = "0123456789abcdef" * 4
+        lines = [
+            f"12:devices:/docker/{container}\n",
+            f"0::/system.slice/cri-containerd-{container}.scope\n",
+            f"1:cpu:/kubepods/besteffort/pod1234-abcd/{container}\n",
+            f"655 650 0:52 /var/lib/docker/containers/{container}/hosts"
+            " /etc/hosts rw - ext4 /dev/sda1 rw\n",
+        ]
+        for line in lines:
+            with self.subTest(line=line), mock.patch(
+                "builtins.open", mock.mock_open(read_data=line)
+            ):
+                self.assertEqual(_get_container_id(), container)
+
+    def test_no_container_id(self):
+        # A checksum in a mount path is not a container id
+        line = f"655 650 0:52 /nix/store/{'ab' * 32}-python / ro - ext4 rw\n"
+        with mock.patch("builtins.open", mock.mock_open(read_data=line)):
+            self.assertIsNone(_get_container_id())
+
     def test_raise_run_time_warning(self):
 
         with self.assertRaises(RuntimeWarning):